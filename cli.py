@@ -1,11 +1,10 @@
+import logging
+import os
 import sys
 from typing import Literal, Optional
 
 import click
 
-from pdf_mind import PDFExtractionAgent
-from pdf_mind.config import PDFExtractionConfig
-
 
 def _format_stats(stats: dict) -> str:
     formatted_stats = f"""
@@ -48,6 +47,11 @@ def cli():
 @click.option("--no-images", is_flag=True, help="Skip image extraction")
 @click.option("--no-llm-ocr", is_flag=True, help="Disable LLM-based OCR fallback")
 @click.option("--save-images", is_flag=True, help="Save extracted images to disk")
+@click.option(
+    "--no-fsync",
+    is_flag=True,
+    help="Skip fsync of the output file (faster, but less durable on crash)",
+)
 @click.option(
     "--image-dir",
     type=click.Path(file_okay=False, dir_okay=True),
@@ -61,12 +65,19 @@ def extract(
     no_images: bool,
     no_llm_ocr: bool,
     save_images: bool,
+    no_fsync: bool,
     image_dir: Optional[str],
 ) -> int:
     """Extract structured content from PDFs using AI.
 
     `pdf_path` is the path to the PDF file to process.
     """
+    # Imported here rather than at module top: these transitively pull in
+    # langchain/langgraph and the PDF libraries, which would put hundreds of
+    # milliseconds of import cost on every --help or info invocation
+    from pdf_mind import PDFExtractionAgent
+    from pdf_mind.config import PDFExtractionConfig
+
     # Create config
     config = PDFExtractionConfig(
         openai_model=model,
@@ -82,25 +93,43 @@ def extract(
         agent = PDFExtractionAgent(
             openai_api_key=config.get_openai_api_key(),
             openai_model=config.openai_model,
+            rasterization_dpi=config.rasterization_dpi,
         )
     except ValueError as e:
         click.echo(f"Error: {e}", err=True)
         return 1
 
-    # Process PDF
+    # Process PDF, streaming the result out as it is produced rather than
+    # buffering the whole content string before the first write
     try:
         click.echo("Processing PDF, this may take a while...")
-        result = agent.process(pdf_path)
 
-        # Output result
         if output_filename:
-            with open(output_filename, "w", encoding="utf-8") as f:
-                f.write(result["content"])
+            # 1 MiB buffer so streamed chunks don't turn into many small
+            # libc writes
+            with open(output_filename, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+                for chunk in agent.process_stream(pdf_path):
+                    f.write(chunk)
+                # Make durability explicit rather than relying on
+                # flush-on-close: fsync by default, skip it when the user
+                # opts out for speed (e.g. scratch output in pipelines)
+                if not no_fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
             click.echo(f"Extracted content saved to {output_filename}")
         else:
-            click.echo(result["content"])
-
-        click.secho(_format_stats(result["stats"]), fg="green")
+            # Write chunks straight to the stdout buffer instead of through
+            # Click's line-buffered wrapper, then flush once at the end
+            last_chunk = ""
+            for chunk in agent.process_stream(pdf_path):
+                sys.stdout.buffer.write(chunk.encode("utf-8"))
+                if chunk:
+                    last_chunk = chunk
+            if not last_chunk.endswith("\n"):
+                sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
+
+        click.secho(_format_stats(agent.get_extraction_stats()), fg="green")
 
         return 0
     except Exception as e:
@@ -130,6 +159,8 @@ def info(version: bool) -> int:
 
 def main() -> int:
     """Main entry point for the CLI."""
+    # The library itself doesn't configure logging; do it here for CLI runs
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     return cli()
 
 
@@ -1,21 +1,57 @@
+import asyncio
 import logging
 import time
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TypedDict, cast
 
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from openai import OpenAI
 
+from pdf_mind.llm import get_async_llm
+from pdf_mind.pdf_document import DEFAULT_RASTER_DPI, PDFDocument
 from pdf_mind.tools.image_extractor import ImageExtractorTool
 from pdf_mind.tools.pdf_reader import PDFReaderTool
 from pdf_mind.tools.table_extractor import TableExtractorTool
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+# Use uvloop's C event loop when available: the workflow fans out many
+# concurrent httpx requests to OpenAI, where cheaper scheduling pays off.
+# Purely optional — everything works on the stdlib loop without it.
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
+# Get logger. Handler/level configuration is left to the application
+# (see cli.py and example.py) — a library shouldn't install handlers at
+# import time, and an unconditional StreamHandler makes every logger.info
+# in the hot extraction paths acquire an emit lock.
 logger = logging.getLogger("pdf_extraction_agent")
 
+# Chunk size for streaming pre-materialized text out of aprocess_stream
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Template for the combination prompt, hoisted out of the builder so each
+# call is a single format pass over precomputed sections
+_COMBINE_PROMPT_TEMPLATE = """I have extracted the following elements from a PDF:
+
+TEXT:
+{text}
+
+TABLES:
+{tables}
+
+IMAGES:
+{images}
+
+Please combine these elements into a well-structured document, maintaining the logical flow.
+Place tables and images near related text. Use markdown formatting.
+"""
+
 
 # Define the state type using TypedDict
 class PDFExtractionState(TypedDict, total=False):
@@ -29,10 +65,14 @@ class PDFExtractionState(TypedDict, total=False):
 
 
 class PDFExtractionAgent:
+    # Compiled LangGraph workflow, shared by all instances (see _create_workflow)
+    _compiled_workflow: Optional[CompiledStateGraph] = None
+
     def __init__(
         self,
         openai_api_key: Optional[str] = None,
         openai_model: str = "gpt-4o",
+        rasterization_dpi: int = DEFAULT_RASTER_DPI,
     ):
         """Initialize the PDF Extraction Agent.
 
@@ -40,16 +80,11 @@ class PDFExtractionAgent:
             openai_api_key: OpenAI API key. If None, it will be read from the
                 OPENAI_API_KEY env var.
             openai_model: OpenAI model to use.
+            rasterization_dpi: Resolution to rasterize PDF pages at.
         """
         self.openai_api_key = openai_api_key
         self.openai_model = openai_model
-
-        # Initialize LangChain LLM
-        self.llm = ChatOpenAI(
-            model=openai_model,
-            api_key=openai_api_key,
-            temperature=0,
-        )
+        self.rasterization_dpi = rasterization_dpi
 
         # Initialize direct OpenAI client for token counting
         self.openai_client = OpenAI(api_key=openai_api_key)
@@ -59,6 +94,11 @@ class PDFExtractionAgent:
         self.image_extractor = ImageExtractorTool()
         self.workflow = self._create_workflow()
         self.last_result = None  # Store the last workflow result
+        self._last_run_time = 0.0  # Wall-clock time of the last run
+
+        # Shared per-PDF document handles so the extraction tools don't each
+        # re-open and re-rasterize the same file
+        self._doc_cache: Dict[str, PDFDocument] = {}
 
         # Token usage tracking
         self.token_usage = {
@@ -68,26 +108,76 @@ class PDFExtractionAgent:
             "api_calls": 0,
         }
 
-    def _create_workflow(self) -> CompiledStateGraph:
-        """Create the LangGraph workflow for PDF extraction."""
+    @property
+    def llm(self) -> ChatOpenAI:
+        """Chat model bound to the running event loop's connection pool.
+
+        Resolved per loop rather than once in __init__: process() and
+        process_stream() each drive a fresh loop, and an httpx pool
+        created under one loop cannot be reused under another. All agent
+        uses of the model happen inside coroutines, where a loop is
+        running.
+        """
+        return get_async_llm(self.openai_model, api_key=self.openai_api_key)
+
+    @classmethod
+    def _create_workflow(cls) -> CompiledStateGraph:
+        """Create the LangGraph workflow for PDF extraction.
+
+        Compilation walks every node and edge, so the compiled graph is
+        built once and shared by all agent instances — short-lived agents
+        (one per CLI invocation) shouldn't each pay the compile cost. The
+        nodes don't capture self; the agent is bound at invocation time by
+        looking it up in the run config, so the graph must be driven with
+        that config in place (see ainvoke_workflow).
+        """
+        if cls._compiled_workflow is not None:
+            return cls._compiled_workflow
+
+        def bind(method_name: str) -> Any:
+            async def node(state: PDFExtractionState, config: RunnableConfig) -> PDFExtractionState:
+                agent: PDFExtractionAgent = config["configurable"]["agent"]
+                return await getattr(agent, method_name)(state)
+
+            return node
+
         workflow = StateGraph(PDFExtractionState)
 
         # Define the nodes
-        workflow.add_node("extract_text", self._extract_text)
-        workflow.add_node("extract_tables", self._extract_tables)
-        workflow.add_node("extract_images", self._extract_images)
-        workflow.add_node("combine_results", self._combine_results)
-
-        # Define the edges
-        workflow.add_edge("extract_text", "extract_tables")
-        workflow.add_edge("extract_tables", "extract_images")
+        workflow.add_node("extract_text", bind("_extract_text"))
+        workflow.add_node("extract_tables", bind("_extract_tables"))
+        workflow.add_node("extract_images", bind("_extract_images"))
+        workflow.add_node("combine_results", bind("_combine_results"))
+
+        # Define the edges. The three extraction stages are independent (each
+        # only reads pdf_path), so fan them out from the entry point and fan
+        # back in at combine_results — LangGraph runs siblings that share a
+        # successor concurrently, so wall-clock time is roughly the slowest
+        # stage rather than the sum of all three.
+        workflow.add_edge(START, "extract_text")
+        workflow.add_edge(START, "extract_tables")
+        workflow.add_edge(START, "extract_images")
+        workflow.add_edge("extract_text", "combine_results")
+        workflow.add_edge("extract_tables", "combine_results")
         workflow.add_edge("extract_images", "combine_results")
         workflow.add_edge("combine_results", END)
 
-        # Set the entry point
-        workflow.set_entry_point("extract_text")
+        cls._compiled_workflow = workflow.compile()
+        return cls._compiled_workflow
 
-        return workflow.compile()
+    def _get_doc(self, pdf_path: str) -> PDFDocument:
+        """Get the shared PDFDocument for a path, creating it on first use."""
+        doc = self._doc_cache.get(pdf_path)
+        if doc is None:
+            doc = PDFDocument(pdf_path, dpi=self.rasterization_dpi)
+            self._doc_cache[pdf_path] = doc
+        return doc
+
+    def _close_doc(self, pdf_path: str) -> None:
+        """Release the shared document handle and its cached page images."""
+        doc = self._doc_cache.pop(pdf_path, None)
+        if doc is not None:
+            doc.close()
 
     async def _extract_text(self, state: PDFExtractionState) -> PDFExtractionState:
         """Extract text from the PDF."""
@@ -95,10 +185,13 @@ class PDFExtractionAgent:
         logger.info("Starting text extraction from PDF: %s", pdf_path)
         start_time = time.time()
         try:
-            text = self.pdf_reader.extract_text(pdf_path)
+            # Run the blocking PyPDF/OCR work in a thread so the other
+            # extraction branches can make progress on the event loop.
+            doc = self._get_doc(pdf_path)
+            text = await asyncio.to_thread(self.pdf_reader.extract_text, pdf_path, doc=doc)
             elapsed = time.time() - start_time
             logger.info("Text extraction completed in %.2f seconds", elapsed)
-            return {"pdf_path": pdf_path, "text": text}
+            return {"text": text}
         except Exception as e:
             logger.error("Text extraction failed: %s", str(e), exc_info=True)
 
@@ -110,14 +203,26 @@ class PDFExtractionAgent:
         logger.info("Starting table extraction from PDF: %s", pdf_path)
         start_time = time.time()
         try:
-            tables = self.table_extractor.extract_tables(pdf_path)
+            doc = self._get_doc(pdf_path)
+            raw_tables = await asyncio.to_thread(self.table_extractor.extract_tables, pdf_path, doc=doc)
+            # Keep only what downstream steps need in state; the raw
+            # row-records from the DataFrame can be large and nothing in the
+            # prompt or stats uses them
+            tables = [
+                {
+                    "page": table.get("page"),
+                    "markdown": table.get("markdown"),
+                    "nrows": table.get("nrows", 0),
+                }
+                for table in raw_tables
+            ]
             elapsed = time.time() - start_time
             logger.info(
                 "Table extraction completed in %.2f seconds, found %d tables",
                 elapsed,
                 len(tables),
             )
-            return {**state, "tables": tables}
+            return {"tables": tables}
         except Exception as e:
             logger.error("Table extraction failed: %s", str(e), exc_info=True)
             raise
@@ -128,14 +233,26 @@ class PDFExtractionAgent:
         logger.info("Starting image extraction from PDF: %s", pdf_path)
         start_time = time.time()
         try:
-            images = self.image_extractor.extract_images(pdf_path, self.llm)
+            doc = self._get_doc(pdf_path)
+            raw_images = await self.image_extractor.aextract_images(pdf_path, self.llm, doc=doc)
+            # Carry descriptions and metadata through state, not raw pixel
+            # data — a PIL image per page is megabytes that the prompt
+            # builder never looks at
+            images = [
+                {
+                    "page": image.get("page"),
+                    "filename": image.get("filename"),
+                    "description": image.get("description"),
+                }
+                for image in raw_images
+            ]
             elapsed = time.time() - start_time
             logger.info(
                 "Image extraction completed in %.2f seconds, found %d images",
                 elapsed,
                 len(images),
             )
-            return {**state, "images": images}
+            return {"images": images}
         except Exception as e:
             logger.error("Image extraction failed: %s", str(e), exc_info=True)
             raise
@@ -144,46 +261,16 @@ class PDFExtractionAgent:
         """Combine all extracted elements into a structured result."""
         logger.info("Starting combination of extracted elements")
         start_time = time.time()
-        try:
-            prompt = self._create_combination_prompt(state)
-            logger.info("Created combination prompt (length: %d chars)", len(prompt))
-
-            system_content = (
-                "You are a PDF content organizer. Your task is to combine text, "
-                "tables, and images into a well-structured document."
-            )
-
-            messages = [
-                SystemMessage(content=system_content),
-                HumanMessage(content=prompt),
-            ]
-
-            # Create messages in OpenAI format for token counting
-            openai_messages = [
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": prompt},
-            ]
 
-            # Get token count for this request
-            tokens_response = self.openai_client.chat.completions.create(
-                model=self.openai_model,
-                messages=openai_messages,
-                max_tokens=1,  # Minimize tokens for just counting
-                temperature=0,
-            )
-
-            # Update token counts
-            self.token_usage["prompt_tokens"] += tokens_response.usage.prompt_tokens
-            self.token_usage["completion_tokens"] += tokens_response.usage.completion_tokens
-            self.token_usage["total_tokens"] += tokens_response.usage.total_tokens
-            self.token_usage["api_calls"] += 1
+        # With no tables or images there is nothing to reorganize, so skip
+        # the LLM round-trip entirely — common for text-only PDFs and when
+        # table/image extraction is disabled
+        if not state.get("tables") and not state.get("images"):
+            logger.info("No tables or images extracted, skipping LLM combination")
+            return {"final_content": state.get("text") or ""}
 
-            logger.info(
-                "Token usage for combination - Prompt: %d, Completion: %d, Total: %d",
-                tokens_response.usage.prompt_tokens,
-                tokens_response.usage.completion_tokens,
-                tokens_response.usage.total_tokens,
-            )
+        try:
+            messages = self._build_combination_messages(state)
 
             # Now make the actual call for the real content
             logger.info("Calling LLM to combine elements")
@@ -194,48 +281,85 @@ class PDFExtractionAgent:
 
             elapsed = time.time() - start_time
             logger.info("Results combination completed in %.2f seconds", elapsed)
-            return {**state, "final_content": response.content}
+            return {"final_content": response.content}
         except Exception as e:
             logger.error("Results combination failed: %s", str(e), exc_info=True)
             raise
 
-    def _create_combination_prompt(self, state: PDFExtractionState) -> str:
-        """Create a prompt for combining the extracted elements."""
-        prompt = f"""I have extracted the following elements from a PDF:
+    def _build_combination_messages(self, state: PDFExtractionState) -> List[Any]:
+        """Build the combination messages and record their token usage."""
+        prompt = self._create_combination_prompt(state)
+        logger.info("Created combination prompt (length: %d chars)", len(prompt))
 
-TEXT:
-{state.get('text', 'No text extracted')}
+        system_content = (
+            "You are a PDF content organizer. Your task is to combine text, "
+            "tables, and images into a well-structured document."
+        )
 
-TABLES:
-{self._format_tables(state.get('tables') or [])}
+        messages = [
+            SystemMessage(content=system_content),
+            HumanMessage(content=prompt),
+        ]
+
+        # Create messages in OpenAI format for token counting
+        openai_messages = [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": prompt},
+        ]
+
+        # Get token count for this request
+        tokens_response = self.openai_client.chat.completions.create(
+            model=self.openai_model,
+            messages=openai_messages,
+            max_tokens=1,  # Minimize tokens for just counting
+            temperature=0,
+        )
 
-IMAGES:
-{self._format_images(state.get('images') or [])}
+        # Update token counts
+        self.token_usage["prompt_tokens"] += tokens_response.usage.prompt_tokens
+        self.token_usage["completion_tokens"] += tokens_response.usage.completion_tokens
+        self.token_usage["total_tokens"] += tokens_response.usage.total_tokens
+        self.token_usage["api_calls"] += 1
+
+        logger.info(
+            "Token usage for combination - Prompt: %d, Completion: %d, Total: %d",
+            tokens_response.usage.prompt_tokens,
+            tokens_response.usage.completion_tokens,
+            tokens_response.usage.total_tokens,
+        )
 
-Please combine these elements into a well-structured document, maintaining the logical flow.
-Place tables and images near related text. Use markdown formatting.
-"""
-        return prompt
+        return messages
+
+    def _create_combination_prompt(self, state: PDFExtractionState) -> str:
+        """Create a prompt for combining the extracted elements."""
+        return _COMBINE_PROMPT_TEMPLATE.format_map(
+            {
+                "text": state.get("text", "No text extracted"),
+                "tables": self._format_tables(state.get("tables") or []),
+                "images": self._format_images(state.get("images") or []),
+            }
+        )
 
     def _format_tables(self, tables: List[Dict[str, Any]]) -> str:
         """Format extracted tables for the prompt."""
         if not tables:
             return "No tables extracted"
 
-        result = ""
-        for i, table in enumerate(tables):
-            result += f"Table {i+1}:\n{table['markdown']}\n\n"
-        return result
+        # Accumulate parts and join once; += on a string is quadratic in the
+        # number of tables. Entries with no markdown are per-page failure
+        # records from the extractor — nothing to show the combiner.
+        parts = [
+            f"Table {i+1}:\n{table['markdown']}\n\n" for i, table in enumerate(tables) if table.get("markdown")
+        ]
+        return "".join(parts) or "No tables extracted"
 
     def _format_images(self, images: List[Dict[str, Any]]) -> str:
         """Format extracted images for the prompt."""
         if not images:
             return "No images extracted"
 
-        result = ""
-        for i, image in enumerate(images):
-            result += f"Image {i+1}: {image['description']}\n\n"
-        return result
+        parts = [f"Image {i+1}: {image['description']}\n\n" for i, image in enumerate(images)]
+        return "".join(parts)
 
     def get_extraction_stats(self) -> Dict[str, Any]:
         """Get statistics from the most recent extraction.
@@ -267,7 +391,8 @@ Place tables and images near related text. Use markdown formatting.
             image_pages = [image.get("page", "unknown") for image in self.last_result.get("images", [])]
             stats["image_pages"] = image_pages
 
-        # Add token usage information
+        # Add timing and token usage information
+        stats["total_time"] = self._last_run_time
         stats["token_usage"] = {
             "prompt_tokens": self.token_usage["prompt_tokens"],
             "completion_tokens": self.token_usage["completion_tokens"],
@@ -277,6 +402,71 @@ Place tables and images near related text. Use markdown formatting.
 
         return stats
 
+    async def _fast_aprocess(self, pdf_path: str) -> PDFExtractionState:
+        """Run the extraction stages directly, without LangGraph dispatch.
+
+        The graph adds per-node scheduling and state-diff bookkeeping that
+        buys nothing on the plain one-PDF path, where no checkpointing or
+        streaming is configured. This runs the same fan-out — the three
+        extraction stages concurrently, then combination — as direct calls.
+        Callers that want graph-level features go through ainvoke_workflow,
+        which binds the agent into the run config the nodes expect.
+        """
+        state = await self._run_extraction_stages(pdf_path)
+        state.update(await self._combine_results(state))
+        return state
+
+    async def _run_extraction_stages(self, pdf_path: str) -> PDFExtractionState:
+        """Run the three extraction stages concurrently and merge their state.
+
+        Shared by the buffered and streaming paths so the fan-out,
+        document cleanup, and error propagation can't drift apart.
+        """
+        state: PDFExtractionState = {"pdf_path": pdf_path}
+        try:
+            # return_exceptions so a failing stage doesn't leave its
+            # siblings reading from a document we're about to close; the
+            # first failure is re-raised once every stage has settled
+            updates = await asyncio.gather(
+                self._extract_text(state),
+                self._extract_tables(state),
+                self._extract_images(state),
+                return_exceptions=True,
+            )
+        finally:
+            self._close_doc(pdf_path)
+        for update in updates:
+            if isinstance(update, BaseException):
+                raise update
+            state.update(update)
+        return state
+
+    async def ainvoke_workflow(self, pdf_path: str) -> PDFExtractionState:
+        """Run the extraction through the compiled LangGraph workflow.
+
+        aprocess drives the stages directly (see _fast_aprocess); this is
+        the entry point for callers that want LangGraph features such as
+        tracing or checkpointing. The compiled graph's nodes resolve
+        their agent from the run config, so invoking self.workflow
+        without this binding fails — go through here instead.
+
+        Args:
+            pdf_path: Path to the PDF file.
+
+        Returns:
+            The final workflow state, including final_content.
+        """
+        try:
+            result = await self.workflow.ainvoke(
+                {"pdf_path": pdf_path},
+                config={"configurable": {"agent": self}},
+            )
+            # The compiled graph types its output as a plain dict even
+            # though it carries the state schema
+            return cast(PDFExtractionState, result)
+        finally:
+            self._close_doc(pdf_path)
+
     async def aprocess(self, pdf_path: str) -> Dict[str, Any]:
         """Process a PDF and extract structured content asynchronously.
 
@@ -297,11 +487,12 @@ Place tables and images near related text. Use markdown formatting.
         logger.info("Starting asynchronous processing of PDF: %s", pdf_path)
         start_time = time.time()
         try:
-            result = await self.workflow.ainvoke({"pdf_path": pdf_path})
+            result = await self._fast_aprocess(pdf_path)
             elapsed = time.time() - start_time
 
             # Store the complete workflow result
             self.last_result = result
+            self._last_run_time = elapsed
 
             # Create extraction stats
             extraction_stats = {
@@ -352,37 +543,114 @@ Place tables and images near related text. Use markdown formatting.
         Returns:
             Dict containing the structured content and extraction stats.
         """
-        import asyncio
-
         logger.info("Starting synchronous processing of PDF: %s", pdf_path)
+        return asyncio.run(self.aprocess(pdf_path))
+
+    async def aprocess_stream(self, pdf_path: str) -> AsyncIterator[str]:
+        """Process a PDF, yielding the final content as it is produced.
+
+        Streaming variant of aprocess: after the extraction stages finish,
+        the combination response is streamed from the LLM chunk by chunk
+        instead of buffered whole, so consumers can start writing output
+        before the full document is materialized. Stats for the run are
+        available via get_extraction_stats afterwards.
+
+        Args:
+            pdf_path: Path to the PDF file.
+
+        Yields:
+            Chunks of the final structured content, in order.
+        """
+        # Reset token usage for this run
+        self.token_usage = {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "api_calls": 0,
+        }
+
+        logger.info("Starting streaming processing of PDF: %s", pdf_path)
         start_time = time.time()
+        state = await self._run_extraction_stages(pdf_path)
+
+        if not state.get("tables") and not state.get("images"):
+            # Nothing to reorganize — stream the extracted text directly
+            logger.info("No tables or images extracted, skipping LLM combination")
+            text = state.get("text") or ""
+            state["final_content"] = text
+            self.last_result = state
+            self._last_run_time = time.time() - start_time
+            for start in range(0, len(text), _STREAM_CHUNK_SIZE):
+                yield text[start : start + _STREAM_CHUNK_SIZE]
+            return
+
+        messages = self._build_combination_messages(state)
+        logger.info("Streaming combined content from LLM")
+        parts: List[str] = []
+        async for chunk in self.llm.astream(messages):
+            piece = chunk.content
+            if piece:
+                parts.append(piece)
+                yield piece
+        self.token_usage["api_calls"] += 1
+
+        state["final_content"] = "".join(parts)
+        self.last_result = state
+        self._last_run_time = time.time() - start_time
+        logger.info("Streaming processing completed in %.2f seconds", self._last_run_time)
+
+    def process_stream(self, pdf_path: str) -> Iterator[str]:
+        """Process a PDF, yielding the final content as it is produced.
+
+        Synchronous wrapper around aprocess_stream for callers like the CLI
+        that want to write output incrementally without holding the whole
+        result string in memory.
+
+        Args:
+            pdf_path: Path to the PDF file.
 
+        Yields:
+            Chunks of the final structured content, in order.
+        """
+        loop = asyncio.new_event_loop()
         try:
-            # Create a new event loop if needed
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    logger.info("Existing event loop is closed, creating new one")
-                    raise RuntimeError("Event loop is closed")
-                logger.info("Using existing event loop")
-            except (RuntimeError, ValueError):
-                logger.info("Creating new event loop")
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            # Run the async process function
-            logger.info("Running async workflow in event loop")
-            result = loop.run_until_complete(self.aprocess(pdf_path))
+            stream = self.aprocess_stream(pdf_path)
+            while True:
+                try:
+                    yield loop.run_until_complete(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
+
+    def process_batch(self, pdf_paths: List[str]) -> List[Dict[str, Any]]:
+        """Process multiple PDFs on a single event loop.
+
+        Creating an event loop per PDF pays selector setup cost on every
+        call and discards the underlying HTTP connection pool between
+        PDFs; sharing one loop amortizes both across the batch.
+
+        The PDFs run concurrently and share the agent's token_usage and
+        last_result, so the per-PDF token stats in each result can mix
+        counts from overlapping runs; treat them as a batch-level
+        aggregate rather than per-document numbers.
 
-            elapsed = time.time() - start_time
-            logger.info("Synchronous PDF processing completed in %.2f seconds", elapsed)
-            return result
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error(
-                "PDF processing failed after %.2f seconds: %s",
-                elapsed,
-                str(e),
-                exc_info=True,
-            )
-            raise
+        Args:
+            pdf_paths: Paths to the PDF files to process.
+
+        Returns:
+            List of result dicts, one per PDF, in input order.
+        """
+        logger.info("Starting batch processing of %d PDFs", len(pdf_paths))
+
+        # The gather (and the aprocess coroutines it wraps) must be set up
+        # inside the running loop — built eagerly out here, ensure_future
+        # would bind the tasks to a different, implicitly-created loop
+        async def run_batch() -> List[Dict[str, Any]]:
+            return await asyncio.gather(*(self.aprocess(path) for path in pdf_paths))
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run_batch())
+        finally:
+            loop.close()
@@ -0,0 +1,184 @@
+import functools
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Get logger
+logger = logging.getLogger("pdf_extraction_agent.cache")
+
+_default_cache: Optional["LLMCache"] = None
+_default_table_cache: Optional["TableCache"] = None
+
+
+@functools.lru_cache(maxsize=64)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 of a file's bytes, hashed in place over an mmap.
+
+    The file is memory-mapped and fed to the hash without copying it onto
+    the Python heap. mtime_ns and size are part of the cache key purely
+    for invalidation — an edited file gets re-hashed, while repeated key
+    computations for the same unchanged file reuse the stored digest
+    instead of re-reading megabytes per call.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            digest.update(mm)
+        finally:
+            mm.close()
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """Disk-backed cache for deterministic LLM responses.
+
+    Both tools call the vision model with temperature=0, so identical
+    prompts (including the embedded image bytes) produce identical
+    responses — re-processing the same PDF during development or batch
+    retries can skip the API call entirely. Entries are plain text files
+    named by a SHA-256 key, written atomically so concurrent workers can
+    share one cache directory.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cached responses in. Defaults to
+                ~/.cache/pdf-mind.
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "pdf-mind")
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(messages: Any, model: str) -> str:
+        """Build a cache key from prompt messages and the model name.
+
+        The messages embed the base64 image payload, so the key covers the
+        image bytes, the prompt text, and the model.
+        """
+        payload = json.dumps(messages, sort_keys=True, default=str).encode()
+        return hashlib.sha256(payload + model.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                value = f.read()
+            logger.debug("LLM cache hit for key %s", key[:12])
+            return value
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("LLM cache read failed for key %s: %s", key[:12], str(e))
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response under a key, replacing any existing entry."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("LLM cache write failed for key %s: %s", key[:12], str(e))
+
+
+class TableCache:
+    """Disk-backed cache for Camelot table extraction results.
+
+    Lattice extraction is deterministic for a given file and page spec, so
+    repeated runs on the same PDF — common in agent loops and tests — can
+    skip the parse entirely. Results are keyed by a SHA-256 of the PDF
+    bytes plus the page spec and stored as JSON files written atomically,
+    following the same layout as LLMCache.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cached results in. Defaults to
+                ~/.cache/pdf-mind.
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "pdf-mind")
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_path: str, pages: str) -> str:
+        """Build a cache key from the PDF content and the page spec.
+
+        Hashing content rather than the path means edits invalidate the
+        entry and copies share one. The content digest itself is memoized
+        per (path, mtime, size), so calls for different page specs of the
+        same file only read its bytes once.
+        """
+        stat = os.stat(pdf_path)
+        content_digest = _file_digest(pdf_path, stat.st_mtime_ns, stat.st_size)
+        return hashlib.sha256(f"{content_digest}|{pages}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".tables.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached table list for a key, or None on a miss."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                tables = json.load(f)
+            logger.debug("Table cache hit for key %s", key[:12])
+            return tables
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Table cache read failed for key %s: %s", key[:12], str(e))
+            return None
+
+    def set(self, key: str, tables: List[Dict[str, Any]]) -> None:
+        """Store a table list under a key, replacing any existing entry."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(tables, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError) as e:
+            logger.warning("Table cache write failed for key %s: %s", key[:12], str(e))
+
+
+def get_default_cache() -> Optional[LLMCache]:
+    """Get the shared LLMCache, or None when caching is disabled.
+
+    Set the PDF_MIND_LLM_CACHE env var to "0" to disable caching, and
+    PDF_MIND_CACHE_DIR to override the cache directory.
+    """
+    global _default_cache
+    if os.environ.get("PDF_MIND_LLM_CACHE", "1") == "0":
+        return None
+    if _default_cache is None:
+        _default_cache = LLMCache(os.environ.get("PDF_MIND_CACHE_DIR"))
+    return _default_cache
+
+
+def get_default_table_cache() -> Optional[TableCache]:
+    """Get the shared TableCache, or None when caching is disabled.
+
+    Set the PDF_MIND_TABLE_CACHE env var to "0" to disable caching, and
+    PDF_MIND_CACHE_DIR to override the cache directory.
+    """
+    global _default_table_cache
+    if os.environ.get("PDF_MIND_TABLE_CACHE", "1") == "0":
+        return None
+    if _default_table_cache is None:
+        _default_table_cache = TableCache(os.environ.get("PDF_MIND_CACHE_DIR"))
+    return _default_table_cache
@@ -32,6 +32,12 @@ class PDFExtractionConfig(BaseModel):
     save_images: bool = Field(
         default=False, description="Whether to save extracted images to disk."
     )
+    rasterization_dpi: int = Field(
+        default=150,
+        description="Resolution to rasterize PDF pages at for OCR and image "
+        "extraction. The vision model caps out around 2048px, so higher "
+        "values mostly waste CPU and RAM.",
+    )
     output_dir: Optional[str] = Field(
         default=None, description="Directory to save extracted images to."
     )
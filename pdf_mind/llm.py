@@ -0,0 +1,211 @@
+import asyncio
+import base64
+import functools
+import io
+import logging
+import os
+import random
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+from langchain_openai import ChatOpenAI
+from PIL import Image
+
+# pybase64's SIMD encoder is a drop-in replacement several times faster
+# than the stdlib for the megabyte-scale image payloads built here; the
+# tools import the alias from here rather than repeating the fallback
+try:
+    import pybase64
+
+    b64encode: "Callable[[bytes | memoryview], bytes]" = pybase64.b64encode
+except ImportError:
+    b64encode = base64.b64encode
+
+# libjpeg-turbo's SIMD DCT encodes 2-4x faster than Pillow's libjpeg path
+# and skips the BytesIO round-trip; fall back to Pillow when the library
+# (or its native libturbojpeg) isn't available
+try:
+    import numpy
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _turbojpeg: "TurboJPEG | None" = TurboJPEG()
+except Exception:  # ImportError, or libturbojpeg missing at load time
+    _turbojpeg = None
+
+# Get logger
+logger = logging.getLogger("pdf_extraction_agent.llm")
+
+# Longest image side sent to the vision API. OpenAI bills vision input per
+# 512px tile, so a full-resolution page render (e.g. 2550x3300) costs ~4x
+# the tokens of a 1536px one while adding no legibility the model can use.
+# Override via PDF_MIND_VISION_MAX_SIDE.
+VISION_MAX_SIDE = int(os.environ.get("PDF_MIND_VISION_MAX_SIDE", "1536"))
+
+# Pool sizing for the shared per-loop clients
+_ASYNC_CLIENT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_ASYNC_CLIENT_TIMEOUT = 60
+
+# One pooled client (and the ChatOpenAI instances bound to it) per event
+# loop: httpx connections belong to the loop that opened them, and
+# process()/process_stream() each drive a fresh loop — a keepalive
+# connection pooled under a since-closed loop fails with "Event loop is
+# closed" when reused. Keyed weakly so discarded loops release their pools.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_llms: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Any], ChatOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_async_client() -> httpx.AsyncClient:
+    """Return the pooled httpx.AsyncClient for the running event loop.
+
+    Concurrent vision calls within one run reuse pooled TLS connections
+    to the OpenAI API instead of paying TCP+TLS setup per call, while
+    separate runs on separate loops each get their own pool.
+
+    Raises:
+        RuntimeError: If called outside a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(limits=_ASYNC_CLIENT_LIMITS, timeout=_ASYNC_CLIENT_TIMEOUT)
+        _async_clients[loop] = client
+    return client
+
+
+def get_async_llm(model: str = "gpt-4o", api_key: Optional[str] = None) -> ChatOpenAI:
+    """Return a ChatOpenAI bound to the running loop's connection pool.
+
+    Instances are cached per (loop, model, key), so repeated runs on one
+    loop share a client while a fresh loop gets a fresh binding — the
+    async OpenAI client inside ChatOpenAI is built at construction and
+    cannot migrate between loops.
+
+    Args:
+        model: OpenAI model name.
+        api_key: Explicit API key; None reads the OPENAI_API_KEY env var.
+
+    Raises:
+        RuntimeError: If called outside a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _async_llms.get(loop)
+    if per_loop is None:
+        per_loop = {}
+        _async_llms[loop] = per_loop
+    cache_key = (model, api_key)
+    llm = per_loop.get(cache_key)
+    if llm is None:
+        logger.info("Creating ChatOpenAI instance for model %s on this event loop", model)
+        llm = ChatOpenAI(
+            model=model,
+            api_key=api_key,
+            temperature=0,
+            http_async_client=get_shared_async_client(),
+        )
+        per_loop[cache_key] = llm
+    return llm
+
+# Failures worth retrying: rate limits, dropped connections, and 5xx
+# responses are transient; anything else (auth, bad request) won't get
+# better by waiting
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    httpx.HTTPError,
+)
+
+# Attempts per prompt before giving up and surfacing the exception
+_MAX_LLM_ATTEMPTS = 4
+
+
+def batch_with_retry(llm: Any, messages_list: List[Any], max_concurrency: int = 8) -> List[Any]:
+    """Dispatch a batch of prompts, retrying transient failures with backoff.
+
+    Rate limits and transient network errors are retried per prompt with
+    exponential backoff plus jitter, so concurrent retries don't hit the
+    endpoint in lockstep. Non-transient errors, and prompts still failing
+    after the last attempt, come back as the exception object in that
+    slot — callers degrade per page instead of losing the whole batch to
+    one hiccup.
+
+    Args:
+        llm: Chat model to dispatch on.
+        messages_list: One message list per prompt.
+        max_concurrency: Cap on in-flight requests.
+
+    Returns:
+        One response (or exception) per prompt, in input order.
+    """
+    config = {"max_concurrency": min(len(messages_list), max_concurrency)}
+    responses = llm.batch(messages_list, config=config, return_exceptions=True)
+    pending = [i for i, response in enumerate(responses) if isinstance(response, _RETRYABLE_ERRORS)]
+    for attempt in range(1, _MAX_LLM_ATTEMPTS):
+        if not pending:
+            break
+        delay = min(2**attempt + random.random(), 30)
+        logger.warning(
+            "Retrying %d failed LLM calls in %.1f seconds (attempt %d/%d): %s",
+            len(pending),
+            delay,
+            attempt + 1,
+            _MAX_LLM_ATTEMPTS,
+            str(responses[pending[0]]),
+        )
+        time.sleep(delay)
+        retries = llm.batch([messages_list[i] for i in pending], config=config, return_exceptions=True)
+        for i, response in zip(pending, retries):
+            responses[i] = response
+        pending = [i for i in pending if isinstance(responses[i], _RETRYABLE_ERRORS)]
+    return responses
+
+
+def encode_jpeg(image: Image.Image, quality: int = 85) -> "bytes | memoryview":
+    """Encode a PIL image to JPEG bytes in a single pass.
+
+    Uses libjpeg-turbo directly on the pixel buffer when available,
+    avoiding the BytesIO staging copy; otherwise falls back to Pillow and
+    hands back a view of the BytesIO buffer rather than a copy of it —
+    callers only pass the result straight to base64, which accepts any
+    bytes-like object. The caller is expected to pass an RGB image.
+
+    Args:
+        image: RGB image to encode.
+        quality: JPEG quality setting.
+
+    Returns:
+        The encoded JPEG bytes (or a memoryview over them).
+    """
+    if _turbojpeg is not None:
+        return _turbojpeg.encode(numpy.asarray(image), quality=quality, pixel_format=TJPF_RGB)
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=quality, optimize=True)
+    return buffered.getbuffer()
+
+
+@functools.lru_cache(maxsize=4)
+def get_llm(model: str = "gpt-4o") -> ChatOpenAI:
+    """Return a long-lived ChatOpenAI instance for synchronous callers.
+
+    Constructing ChatOpenAI reads env vars, builds an httpx client, and
+    discovers defaults — needless overhead when the tools fall back to a
+    default LLM per call. Instances are cached per model name. The tools
+    only drive these through the synchronous batch API; coroutines should
+    use get_async_llm, which binds to the running loop's pool.
+
+    Args:
+        model: OpenAI model name.
+
+    Returns:
+        A cached ChatOpenAI instance with temperature 0.
+    """
+    logger.info("Creating shared ChatOpenAI instance for model %s", model)
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+    )
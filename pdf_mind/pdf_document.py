@@ -0,0 +1,209 @@
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from typing import IO, Any, Iterator, List, Optional, Tuple, cast
+
+import pymupdf
+import pypdf
+from PIL import Image
+
+# Get logger
+logger = logging.getLogger("pdf_extraction_agent.pdf_document")
+
+# Default rasterization resolution. 200 dpi overshoots the vision model's
+# effective input resolution (~2048px tile cap), so 150 dpi cuts pixel
+# count ~44% with no quality the model can actually use lost
+DEFAULT_RASTER_DPI = 150
+
+
+def _pixmap_to_image(pix: pymupdf.Pixmap) -> Image.Image:
+    """Convert a PyMuPDF pixmap to a PIL image without a disk round-trip."""
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+# Rendering is worth splitting across processes only for documents long
+# enough to amortize worker startup and result pickling
+_MIN_PAGES_FOR_POOL = 8
+
+# The pools here run inside asyncio.to_thread workers, next to httpx and
+# logging threads — forking a multithreaded process can deadlock a child
+# on a lock some other thread held at fork time (and is deprecated on
+# 3.12+). Prefer forkserver, which forks from a clean single-threaded
+# server process; fall back to spawn where it's unavailable (e.g. macOS
+# without fork support, Windows).
+_MP_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def get_mp_context() -> multiprocessing.context.BaseContext:
+    """Return the multiprocessing context the page-sharding pools use.
+
+    All worker functions dispatched through this context are module-level
+    functions with picklable arguments, as forkserver/spawn require.
+    """
+    return multiprocessing.get_context(_MP_START_METHOD)
+
+
+def _render_page_range(args: Tuple[str, int, int, int]) -> List[Image.Image]:
+    """Render one slice of pages; runs in a worker process.
+
+    The document is re-opened per worker because PyMuPDF documents are
+    neither picklable nor safe to share across processes.
+    """
+    pdf_path, start, stop, dpi = args
+    with pymupdf.open(pdf_path) as doc:
+        return [_pixmap_to_image(doc[i].get_pixmap(dpi=dpi)) for i in range(start, stop)]
+
+
+def rasterize_pdf(pdf_path: str, dpi: int = DEFAULT_RASTER_DPI) -> List[Image.Image]:
+    """Render all pages of a PDF to PIL images.
+
+    Uses PyMuPDF's in-process C renderer, which avoids pdf2image's
+    pdftoppm subprocess and temp-file marshaling per batch. Long documents
+    are partitioned into page ranges rendered by a process pool, since a
+    single renderer is otherwise pinned to one core.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        dpi: Resolution to render at.
+
+    Returns:
+        One PIL image per page, in page order.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        page_count = len(doc)
+        workers = min(os.cpu_count() or 1, 8)
+        if page_count < _MIN_PAGES_FOR_POOL or workers <= 1:
+            return [_pixmap_to_image(page.get_pixmap(dpi=dpi)) for page in doc]
+
+    pages_per_worker = math.ceil(page_count / workers)
+    ranges = [
+        (pdf_path, start, min(start + pages_per_worker, page_count), dpi)
+        for start in range(0, page_count, pages_per_worker)
+    ]
+    logger.info("Rasterizing %d pages across %d worker processes", page_count, len(ranges))
+    with get_mp_context().Pool(len(ranges)) as pool:
+        chunks = pool.map(_render_page_range, ranges)
+    return [image for chunk in chunks for image in chunk]
+
+
+def iter_rasterized_pages(pdf_path: str, dpi: int = DEFAULT_RASTER_DPI) -> Iterator[Image.Image]:
+    """Render a PDF's pages to PIL images one at a time.
+
+    Generator counterpart to rasterize_pdf for callers that consume pages
+    sequentially and then drop them: only one rendered page is held in
+    memory at a time, so peak RSS stays O(1 page) regardless of document
+    length.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        dpi: Resolution to render at.
+
+    Yields:
+        One PIL image per page, in page order.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        for page in doc:
+            yield _pixmap_to_image(page.get_pixmap(dpi=dpi))
+
+
+def rasterize_pages(pdf_path: str, page_indices: List[int], dpi: int = DEFAULT_RASTER_DPI) -> List[Image.Image]:
+    """Render a subset of a PDF's pages to PIL images.
+
+    Used when only a few pages need pixels (e.g. OCRing the handful of
+    pages that yielded no text), so the rest of the document is never
+    rendered.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_indices: Zero-based indices of the pages to render.
+        dpi: Resolution to render at.
+
+    Returns:
+        One PIL image per requested page, in the order given.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        return [_pixmap_to_image(doc[i].get_pixmap(dpi=dpi)) for i in page_indices]
+
+
+class PDFDocument:
+    """A lazily opened PDF shared across the extraction tools.
+
+    The text, table, and image tools each need the parsed PDF and/or its
+    pages rasterized to images. Opening and rasterizing are expensive, so
+    this class memoizes both: the pypdf reader and the per-page images are
+    created on first use and reused by every tool working on the same file.
+
+    The file is memory-mapped once and both the pypdf reader and the
+    rasterizer are fed from the same mapping, so the bytes are read from
+    disk a single time no matter how many tools touch the document.
+
+    The extraction stages run concurrently, so access is guarded by a lock.
+    """
+
+    def __init__(self, pdf_path: str, dpi: int = DEFAULT_RASTER_DPI):
+        """Initialize the document wrapper.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            dpi: Resolution to rasterize pages at.
+        """
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self._file: Optional[IO[bytes]] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._reader: Optional[pypdf.PdfReader] = None
+        self._page_images: Optional[List[Image.Image]] = None
+        self._lock = threading.Lock()
+
+    def _mapped(self) -> mmap.mmap:
+        """Memory-map the PDF on first access. Caller must hold the lock."""
+        if self._mm is None:
+            logger.info("Memory-mapping PDF: %s", self.pdf_path)
+            self._file = open(self.pdf_path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    @property
+    def reader(self) -> pypdf.PdfReader:
+        """Return the pypdf reader, mapping the file on first access."""
+        with self._lock:
+            if self._reader is None:
+                # mmap objects are seekable file-like objects, so pypdf can
+                # parse straight from the mapping; the cast papers over
+                # pypdf's narrower IO annotation
+                self._reader = pypdf.PdfReader(cast(IO[Any], self._mapped()))
+            return self._reader
+
+    def page_images(self) -> List[Image.Image]:
+        """Return the rasterized pages, rendering them on first access."""
+        with self._lock:
+            if self._page_images is None:
+                logger.info("Rasterizing PDF pages: %s", self.pdf_path)
+                start_time = time.time()
+                # Rendered from the path rather than the mapping: long
+                # documents fan out across a process pool, and each worker
+                # has to re-open the file anyway
+                self._page_images = rasterize_pdf(self.pdf_path, dpi=self.dpi)
+                elapsed = time.time() - start_time
+                logger.info(
+                    "Rasterized %d pages in %.2f seconds",
+                    len(self._page_images),
+                    elapsed,
+                )
+            return self._page_images
+
+    def close(self) -> None:
+        """Release the mapping, the file handle, and cached page images."""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._reader = None
+            self._page_images = None
@@ -1,14 +1,15 @@
-import base64
-import io
+import asyncio
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from langchain_openai import ChatOpenAI
-from pdf2image import convert_from_path
 from PIL import Image
 
+from pdf_mind.cache import LLMCache, get_default_cache
+from pdf_mind.llm import VISION_MAX_SIDE, b64encode, encode_jpeg, get_llm
+from pdf_mind.pdf_document import PDFDocument, iter_rasterized_pages
+
 # Get logger
 logger = logging.getLogger("pdf_extraction_agent.image_extractor")
 
@@ -22,6 +23,7 @@ class ImageExtractorTool:
         llm: Optional[Any] = None,
         save_images: bool = False,
         output_dir: Optional[str] = None,
+        doc: Optional[PDFDocument] = None,
     ) -> List[Dict[str, Any]]:
         """Extract images from a PDF file with AI-generated descriptions.
 
@@ -30,15 +32,14 @@ class ImageExtractorTool:
             llm: Vision-capable LLM for image descriptions. If None, it will be created.
             save_images: Whether to save extracted images to disk.
             output_dir: Directory to save images to. If None, a temporary directory is used.
+            doc: Shared PDFDocument to reuse rasterized pages. If None, the
+                PDF is rasterized directly.
 
         Returns:
             List of extracted images with page number, filename, and description.
         """
         if llm is None:
-            llm = ChatOpenAI(
-                model="gpt-4o",
-                temperature=0,
-            )
+            llm = get_llm("gpt-4o")
 
         # Create output directory if needed
         if save_images:
@@ -46,21 +47,103 @@ class ImageExtractorTool:
                 output_dir = os.path.join(os.path.dirname(pdf_path), "extracted_images")
             os.makedirs(output_dir, exist_ok=True)
 
-        # Extract images from PDF
-        images = self._extract_images_from_pdf(pdf_path)
-
-        # Get descriptions for images
+        # Extract, describe, and save one page at a time — the generator
+        # keeps a single rendered page alive instead of materializing the
+        # whole document before the description loop
         result = []
-        for i, img_data in enumerate(images):
-            # Generate description using LLM
-            description = self._generate_description(img_data["image"], llm)
+        try:
+            for i, img_data in enumerate(self._iter_page_images(pdf_path, doc=doc)):
+                # Encode once for the LLM payload; the saved file reuses the
+                # same bytes unless the vision cap downscaled them
+                jpeg_bytes = self._encode_jpeg(img_data["image"])
+
+                # Generate description using LLM
+                description = self._generate_description(img_data["image"], llm, jpeg_bytes=jpeg_bytes)
+
+                # Save image if requested
+                filename = None
+                if save_images and output_dir is not None:
+                    filename = f"page_{img_data['page']}_image_{i+1}.jpg"
+                    img_path = os.path.join(output_dir, filename)
+                    with open(img_path, "wb") as f:
+                        f.write(self._archival_jpeg(img_data["image"], jpeg_bytes))
+
+                result.append(
+                    {
+                        "page": img_data["page"],
+                        "filename": filename,
+                        "description": description,
+                        "image": img_data["image"] if not save_images else None,
+                    }
+                )
+        except Exception as e:
+            logger.error("Error extracting images from PDF: %s", str(e), exc_info=True)
+
+        return result
+
+    async def aextract_images(
+        self,
+        pdf_path: str,
+        llm: Optional[Any] = None,
+        save_images: bool = False,
+        output_dir: Optional[str] = None,
+        doc: Optional[PDFDocument] = None,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """Extract images with descriptions, generating descriptions concurrently.
+
+        Async variant of extract_images: the per-image vision calls are issued
+        concurrently (bounded by a semaphore to respect rate limits) instead of
+        one round-trip at a time, so total latency approaches that of the
+        slowest call rather than the sum.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            llm: Vision-capable LLM for image descriptions. If None, it will be created.
+            save_images: Whether to save extracted images to disk.
+            output_dir: Directory to save images to. If None, a temporary directory is used.
+            doc: Shared PDFDocument to reuse rasterized pages. If None, the
+                PDF is rasterized directly.
+            max_concurrency: Maximum number of in-flight LLM calls.
+
+        Returns:
+            List of extracted images with page number, filename, and description.
+        """
+        if llm is None:
+            llm = get_llm("gpt-4o")
+
+        # Create output directory if needed
+        if save_images:
+            if output_dir is None:
+                output_dir = os.path.join(os.path.dirname(pdf_path), "extracted_images")
+            os.makedirs(output_dir, exist_ok=True)
 
+        # Extract images from PDF without blocking the event loop
+        images = await asyncio.to_thread(self._extract_images_from_pdf, pdf_path, doc)
+
+        # Generate descriptions concurrently under a bounded semaphore. Each
+        # image is encoded once for the LLM payload; a saved file reuses the
+        # same bytes unless the vision cap downscaled them
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def describe(image: Image.Image) -> tuple:
+            async with semaphore:
+                jpeg_bytes = await asyncio.to_thread(self._encode_jpeg, image)
+                description = await self._agenerate_description(image, llm, jpeg_bytes=jpeg_bytes)
+                return jpeg_bytes, description
+
+        logger.info("Generating descriptions for %d images (max %d concurrent)", len(images), max_concurrency)
+        described = await asyncio.gather(*(describe(img_data["image"]) for img_data in images))
+
+        result = []
+        for i, (img_data, (jpeg_bytes, description)) in enumerate(zip(images, described)):
             # Save image if requested
             filename = None
             if save_images and output_dir is not None:
-                filename = f"page_{img_data['page']}_image_{i+1}.png"
+                filename = f"page_{img_data['page']}_image_{i+1}.jpg"
                 img_path = os.path.join(output_dir, filename)
-                img_data["image"].save(img_path)
+                with open(img_path, "wb") as f:
+                    f.write(self._archival_jpeg(img_data["image"], jpeg_bytes))
 
             result.append(
                 {
@@ -73,27 +156,34 @@ class ImageExtractorTool:
 
         return result
 
-    def _extract_images_from_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """Extract images from PDF pages."""
+    def _iter_page_images(self, pdf_path: str, doc: Optional[PDFDocument] = None) -> Iterator[Dict[str, Any]]:
+        """Yield images from PDF pages one at a time.
+
+        With a shared document the already-rasterized pages are reused;
+        otherwise pages are rendered lazily so only the page currently
+        being processed is held in memory.
+        """
         logger.info("Extracting images from PDF: %s", pdf_path)
+        # For real image extraction, we would use more sophisticated methods
+        # such as object detection to identify image regions
+        # For now, we'll use the whole page as an image
+        if doc is not None:
+            page_images: Iterable[Image.Image] = doc.page_images()
+        else:
+            page_images = iter_rasterized_pages(pdf_path)
+        for page_num, page_image in enumerate(page_images, 1):
+            logger.debug("Processing page %d for image extraction", page_num)
+            yield {"page": page_num, "image": page_image}
+
+    def _extract_images_from_pdf(self, pdf_path: str, doc: Optional[PDFDocument] = None) -> List[Dict[str, Any]]:
+        """Extract images from PDF pages as a list.
+
+        Materializing wrapper around _iter_page_images for the async path,
+        which wants every image up front to describe them concurrently.
+        """
         start_time = time.time()
         try:
-            # Convert PDF pages to images
-            logger.info("Converting PDF pages to images")
-            conversion_start = time.time()
-            page_images = convert_from_path(pdf_path)
-            conversion_time = time.time() - conversion_start
-            logger.info("PDF converted to %d images in %.2f seconds", len(page_images), conversion_time)
-
-            result = []
-
-            for page_num, page_image in enumerate(page_images, 1):
-                logger.info("Processing page %d/%d for image extraction", page_num, len(page_images))
-                # For real image extraction, we would use more sophisticated methods
-                # such as object detection to identify image regions
-                # For now, we'll use the whole page as an image
-                result.append({"page": page_num, "image": page_image})
-
+            result = list(self._iter_page_images(pdf_path, doc=doc))
             elapsed = time.time() - start_time
             logger.info("Image extraction completed in %.2f seconds, extracted %d images", elapsed, len(result))
             return result
@@ -102,53 +192,152 @@ class ImageExtractorTool:
             logger.error("Error extracting images from PDF after %.2f seconds: %s", elapsed, str(e), exc_info=True)
             return []
 
-    def _generate_description(self, image: Image.Image, llm: Any) -> str:
+    def _encode_jpeg(self, image: Image.Image, cap: bool = True) -> "bytes | memoryview":
+        """Encode an image to JPEG bytes.
+
+        JPEG at quality 85 keeps the payload several times smaller than PNG
+        for page-sized rasters and avoids PNG's deflate cost; fewer bytes
+        also means fewer vision tokens. Images larger than the vision cap
+        are downscaled first — the API bills per 512px tile, so excess
+        resolution is pure token cost. Pass cap=False to encode at the
+        source resolution, e.g. for the copy written to disk.
+        """
+        encode_start = time.time()
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if cap and max(image.size) > VISION_MAX_SIDE:
+            # Work on a copy: thumbnail resizes in place and the page images
+            # may be shared with the other tools
+            image = image.copy()
+            image.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.Resampling.LANCZOS)
+        jpeg_bytes = encode_jpeg(image)
+        encode_time = time.time() - encode_start
+        logger.debug("Image encoded in %.2f seconds", encode_time)
+        return jpeg_bytes
+
+    def _archival_jpeg(self, image: Image.Image, jpeg_bytes: "bytes | memoryview") -> "bytes | memoryview":
+        """Return the JPEG bytes to write to disk for an extracted image.
+
+        The LLM payload is capped to the vision resolution, but the saved
+        copy should keep the full render — re-encode without the cap only
+        when the image was actually downscaled, otherwise reuse the
+        already-encoded payload bytes.
+        """
+        if max(image.size) > VISION_MAX_SIDE:
+            return self._encode_jpeg(image, cap=False)
+        return jpeg_bytes
+
+    def _description_messages(
+        self, image: Image.Image, jpeg_bytes: "Optional[bytes | memoryview]" = None
+    ) -> List[Dict[str, Any]]:
+        """Build the vision prompt messages for describing an image.
+
+        Args:
+            image: The image to describe.
+            jpeg_bytes: Pre-encoded JPEG bytes for the image, to avoid
+                encoding it twice. If None, the image is encoded here.
+        """
+        # Encode image to base64 for API
+        logger.debug("Encoding image for LLM description")
+        if jpeg_bytes is None:
+            jpeg_bytes = self._encode_jpeg(image)
+        img_str = b64encode(jpeg_bytes).decode("ascii")
+
+        # Create prompt with the image
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Describe this image in detail. Focus on the visual content, any text present, "
+                        "and its relevance to the document. Provide a comprehensive description that "
+                        "could replace the image if needed.",
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpeg;base64,{img_str}"},
+                    },
+                ],
+            }
+        ]
+
+    def _log_description_response(self, response: Any, llm_time: float) -> str:
+        """Log timing/token info for a description response and return its text."""
+        description = response.content
+        logger.debug("LLM generated description (%d chars) in %.2f seconds", len(description), llm_time)
+
+        # Note: For the vision API, we can't directly count tokens as easily as with text
+        # Token usage may be tracked in the llm object if available
+        if hasattr(response, "usage") and response.usage is not None:
+            logger.debug("Image token usage - Total: %s", getattr(response.usage, "total_tokens", "unknown"))
+
+        return description
+
+    def _generate_description(
+        self, image: Image.Image, llm: Any, jpeg_bytes: "Optional[bytes | memoryview]" = None
+    ) -> str:
         """Generate a description for an image using a vision-capable LLM."""
         start_time = time.time()
         try:
-            # Encode image to base64 for API
-            logger.info("Encoding image for LLM description")
-            encode_start = time.time()
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            encode_time = time.time() - encode_start
-            logger.info("Image encoded in %.2f seconds", encode_time)
-
-            # Create prompt with the image
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Describe this image in detail. Focus on the visual content, any text present, "
-                            "and its relevance to the document. Provide a comprehensive description that "
-                            "could replace the image if needed.",
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{img_str}"},
-                        },
-                    ],
-                }
-            ]
+            messages = self._description_messages(image, jpeg_bytes=jpeg_bytes)
+
+            # The LLM runs at temperature=0, so identical image+prompt pairs
+            # can be served from the response cache
+            cache = get_default_cache()
+            cache_key = None
+            if cache is not None:
+                cache_key = LLMCache.make_key(messages, getattr(llm, "model_name", "") or "")
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
             # Call LLM
-            logger.info("Sending image to LLM API for description")
+            logger.debug("Sending image to LLM API for description")
             llm_start = time.time()
             response = llm.invoke(messages)
-            description = response.content
-            llm_time = time.time() - llm_start
-            logger.info("LLM generated description (%d chars) in %.2f seconds", len(description), llm_time)
+            description = self._log_description_response(response, time.time() - llm_start)
+
+            if cache is not None and cache_key is not None:
+                cache.set(cache_key, description)
+
+            elapsed = time.time() - start_time
+            logger.debug("Description generation completed in %.2f seconds", elapsed)
+            return description
+        except Exception as e:
+            elapsed = time.time() - start_time
+            logger.error("Error generating image description after %.2f seconds: %s", elapsed, str(e), exc_info=True)
+            return "Image description unavailable"
+
+    async def _agenerate_description(
+        self, image: Image.Image, llm: Any, jpeg_bytes: "Optional[bytes | memoryview]" = None
+    ) -> str:
+        """Generate a description for an image using a vision-capable LLM asynchronously."""
+        start_time = time.time()
+        try:
+            messages = await asyncio.to_thread(self._description_messages, image, jpeg_bytes)
+
+            # The LLM runs at temperature=0, so identical image+prompt pairs
+            # can be served from the response cache
+            cache = get_default_cache()
+            cache_key = None
+            if cache is not None:
+                cache_key = LLMCache.make_key(messages, getattr(llm, "model_name", "") or "")
+                cached = await asyncio.to_thread(cache.get, cache_key)
+                if cached is not None:
+                    return cached
+
+            # Call LLM
+            logger.debug("Sending image to LLM API for description")
+            llm_start = time.time()
+            response = await llm.ainvoke(messages)
+            description = self._log_description_response(response, time.time() - llm_start)
 
-            # Note: For the vision API, we can't directly count tokens as easily as with text
-            # Token usage may be tracked in the llm object if available
-            if hasattr(response, "usage") and response.usage is not None:
-                logger.info("Image token usage - Total: %s", getattr(response.usage, "total_tokens", "unknown"))
+            if cache is not None and cache_key is not None:
+                await asyncio.to_thread(cache.set, cache_key, description)
 
             elapsed = time.time() - start_time
-            logger.info("Description generation completed in %.2f seconds", elapsed)
+            logger.debug("Description generation completed in %.2f seconds", elapsed)
             return description
         except Exception as e:
             elapsed = time.time() - start_time
@@ -1,156 +1,345 @@
-import base64
-import io
 import logging
+import math
+import os
+import re
 import time
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 
+import pymupdf
 import pypdf
-from langchain_openai import ChatOpenAI
-from pdf2image import convert_from_path
+from PIL import Image
+
+from pdf_mind.cache import LLMCache, get_default_cache
+from pdf_mind.llm import VISION_MAX_SIDE, b64encode, batch_with_retry, encode_jpeg, get_llm
+from pdf_mind.pdf_document import PDFDocument, get_mp_context, rasterize_pages, rasterize_pdf
 
 # Get logger
 logger = logging.getLogger("pdf_extraction_agent.pdf_reader")
 
+# Page-level text extraction is CPU-bound, so long documents are split
+# across worker processes; short ones stay serial since fork and pickling
+# overhead would dominate
+_MIN_PAGES_FOR_POOL = 20
+
+# Threads for JPEG-encoding page images before the OCR batch; PIL releases
+# the GIL inside libjpeg so a small pool overlaps the encodes
+_ENCODE_THREADS = 4
+
+# Pages with fewer word-like tokens than this are treated as scanned or
+# image-heavy and routed to the OCR fallback
+_MIN_WORDS_PER_PAGE = 20
+_WORD_RE = re.compile(r"\S+")
+
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[str]:
+    """Extract text for one slice of pages; runs in a worker process.
+
+    Each worker opens its own document — PyMuPDF documents aren't picklable
+    and aren't safe to share across processes.
+    """
+    pdf_path, start, stop = args
+    with pymupdf.open(pdf_path) as pdf:
+        return [pdf[i].get_text("text") or "" for i in range(start, stop)]
+
 
 class PDFReaderTool:
     """Tool for extracting text from PDFs using PyPDF and Vision LLM for OCR."""
 
-    def extract_text(self, pdf_path: str, llm: Optional[Any] = None, fallback_to_llm_ocr: bool = True) -> str:
+    def extract_text(
+        self,
+        pdf_path: str,
+        llm: Optional[Any] = None,
+        fallback_to_llm_ocr: bool = True,
+        doc: Optional[PDFDocument] = None,
+    ) -> str:
         """Extract text from a PDF file.
 
         Args:
             pdf_path: Path to the PDF file.
             llm: LLM instance for OCR (must support vision). If None, it will be created.
             fallback_to_llm_ocr: Whether to use LLM-based OCR if PyPDF fails.
+            doc: Shared PDFDocument to reuse the opened file and rasterized
+                pages. If None, the file is opened directly.
 
         Returns:
             Extracted text from the PDF.
         """
-        # First try using PyPDF
-        text = self._extract_with_pypdf(pdf_path)
-
-        # If text is empty or looks incomplete and fallback is enabled, use LLM OCR
-        if not text or (fallback_to_llm_ocr and self._is_text_incomplete(text)):
-            if llm is None:
-                llm = ChatOpenAI(
-                    model="gpt-4o",
-                    temperature=0,
-                )
-            text = self._extract_with_llm_ocr(pdf_path, llm)
-
-        return text
-
-    def _extract_with_pypdf(self, pdf_path: str) -> str:
-        """Extract text using PyPDF."""
-        logger.info("Extracting text with PyPDF from %s", pdf_path)
+        # First try native library extraction, page by page
+        page_texts = self._extract_pages(pdf_path, doc=doc)
+
+        if not page_texts:
+            # Extraction failed outright — OCR the whole document
+            if fallback_to_llm_ocr:
+                if llm is None:
+                    llm = get_llm("gpt-4o")
+                return self._extract_with_llm_ocr(pdf_path, llm, doc=doc)
+            return ""
+
+        # OCR only the pages that came back empty or too short — on a
+        # mostly-text document with a few scanned pages this cuts the OCR
+        # cost to the scanned fraction instead of re-OCRing every page
+        if fallback_to_llm_ocr:
+            incomplete = [i for i, page_text in enumerate(page_texts) if self._is_text_incomplete(page_text)]
+            if incomplete:
+                logger.info("OCRing %d of %d pages with missing or short text", len(incomplete), len(page_texts))
+                if llm is None:
+                    llm = get_llm("gpt-4o")
+                if doc is not None:
+                    images = doc.page_images()
+                    selected = [images[i] for i in incomplete]
+                else:
+                    selected = rasterize_pages(pdf_path, incomplete)
+                ocr_texts = self._ocr_page_images(selected, [i + 1 for i in incomplete], llm)
+                for i, ocr_text in zip(incomplete, ocr_texts):
+                    if ocr_text:
+                        page_texts[i] = ocr_text
+
+        return self._join_page_texts(page_texts)
+
+    def _extract_with_pypdf(self, pdf_path: str, doc: Optional[PDFDocument] = None) -> str:
+        """Extract text with PyMuPDF, falling back to pypdf.
+
+        PyMuPDF runs the content-stream parser in native C and is an order
+        of magnitude faster than pypdf's pure-Python one, so it is the
+        primary path; pypdf remains the fallback for files MuPDF rejects.
+        The method name is kept for API compatibility.
+        """
+        return self._join_page_texts(self._extract_pages(pdf_path, doc=doc))
+
+    def _extract_pages(self, pdf_path: str, doc: Optional[PDFDocument] = None) -> List[str]:
+        """Extract text per page with the native libraries.
+
+        Returns:
+            One string per page, in page order; empty list if extraction
+            failed entirely.
+        """
+        logger.info("Extracting text from %s", pdf_path)
         start_time = time.time()
         try:
-            text = ""
-            with open(pdf_path, "rb") as file:
-                reader = pypdf.PdfReader(file)
-                logger.info("PDF has %d pages", len(reader.pages))
-                for i, page in enumerate(reader.pages):
-                    page_start = time.time()
-                    logger.info("Extracting text from page %d/%d", i + 1, len(reader.pages))
-                    page_text = page.extract_text()
-                    page_time = time.time() - page_start
-                    if page_text:
-                        text += page_text + "\n\n"
-                        logger.info("Extracted %d chars from page %d in %.2f seconds", len(page_text), i + 1, page_time)
-                    else:
-                        logger.warning("No text extracted from page %d", i + 1)
+            try:
+                page_texts = self._extract_page_texts(pdf_path)
+            except Exception as e:
+                logger.warning("PyMuPDF extraction failed (%s), falling back to pypdf", str(e))
+                page_texts = self._extract_page_texts_pypdf(pdf_path, doc=doc)
             elapsed = time.time() - start_time
-            logger.info("PyPDF extraction completed in %.2f seconds, total %d chars", elapsed, len(text))
-            return text
+            logger.info("Text extraction completed in %.2f seconds for %d pages", elapsed, len(page_texts))
+            return page_texts
         except Exception as e:
             elapsed = time.time() - start_time
-            logger.error("Error extracting text with PyPDF after %.2f seconds: %s", elapsed, str(e), exc_info=True)
-            return ""
+            logger.error("Error extracting text after %.2f seconds: %s", elapsed, str(e), exc_info=True)
+            return []
+
+    def _join_page_texts(self, page_texts: List[str]) -> str:
+        """Join per-page texts into the final document text."""
+        # Accumulate page texts and join once at the end — += on a
+        # growing string is quadratic over hundreds of pages
+        parts: List[str] = []
+        empty_pages = []
+        for i, page_text in enumerate(page_texts):
+            if page_text:
+                parts.append(page_text)
+                parts.append("\n\n")
+            else:
+                empty_pages.append(i + 1)
+        if empty_pages:
+            # One aggregated line instead of a warning per page — scanned
+            # documents would otherwise emit hundreds of them
+            logger.warning("No text extracted from %d pages: %s", len(empty_pages), empty_pages)
+        return "".join(parts)
+
+    def _extract_page_texts(self, pdf_path: str) -> List[str]:
+        """Extract per-page text with PyMuPDF, fanning out for long documents."""
+        with pymupdf.open(pdf_path) as pdf:
+            page_count = len(pdf)
+            logger.info("PDF has %d pages", page_count)
+            workers = min(os.cpu_count() or 1, 8)
+            if page_count < _MIN_PAGES_FOR_POOL or workers <= 1:
+                return [page.get_text("text") or "" for page in pdf]
+
+        # Partition the page range across a process pool and reassemble in
+        # page order
+        pages_per_worker = math.ceil(page_count / workers)
+        ranges = [
+            (pdf_path, range_start, min(range_start + pages_per_worker, page_count))
+            for range_start in range(0, page_count, pages_per_worker)
+        ]
+        logger.info("Extracting %d pages across %d worker processes", page_count, len(ranges))
+        with get_mp_context().Pool(len(ranges)) as pool:
+            chunks = pool.map(_extract_page_range, ranges)
+        return [page_text for chunk in chunks for page_text in chunk]
+
+    def _extract_page_texts_pypdf(self, pdf_path: str, doc: Optional[PDFDocument] = None) -> List[str]:
+        """Extract per-page text with pypdf; fallback for files MuPDF rejects."""
+        file = None
+        try:
+            if doc is not None:
+                reader = doc.reader
+            else:
+                file = open(pdf_path, "rb")
+                reader = pypdf.PdfReader(file)
+            return [page.extract_text() or "" for page in reader.pages]
+        finally:
+            if file is not None:
+                file.close()
 
     def _is_text_incomplete(self, text: str) -> bool:
-        """Check if the extracted text seems incomplete."""
+        """Check if a page's extracted text seems incomplete."""
         # This is a simple heuristic - improve based on your needs
         if not text:
             return True
 
-        # If text is very short or has very few words per page, it might be incomplete
-        words = text.split()
-        if len(words) < 100:  # Arbitrary threshold
-            return True
-
-        return False
+        # A page with very few words is likely scanned or image-heavy.
+        # Count word-like tokens with an early exit rather than
+        # text.split(), which allocates a string per token just to be
+        # counted and discarded.
+        count = 0
+        for _ in _WORD_RE.finditer(text):
+            count += 1
+            if count >= _MIN_WORDS_PER_PAGE:
+                return False
+        return True
 
-    def _extract_with_llm_ocr(self, pdf_path: str, llm: Any) -> str:
+    def _extract_with_llm_ocr(self, pdf_path: str, llm: Any, doc: Optional[PDFDocument] = None) -> str:
         """Extract text using a vision-capable LLM for OCR."""
         logger.info("Extracting text with LLM OCR from %s", pdf_path)
         start_time = time.time()
         try:
-            # Convert PDF to images
+            # Convert PDF to images, reusing the shared rasterization if available
             logger.info("Converting PDF to images")
             conversion_start = time.time()
-            images = convert_from_path(pdf_path)
+            if doc is not None:
+                images = doc.page_images()
+            else:
+                images = rasterize_pdf(pdf_path)
             conversion_time = time.time() - conversion_start
             logger.info("PDF converted to %d images in %.2f seconds", len(images), conversion_time)
 
-            all_text = ""
-            total_tokens = 0
+            page_texts = self._ocr_page_images(images, list(range(1, len(images) + 1)), llm)
 
-            for i, img in enumerate(images):
-                logger.info("Processing image %d/%d with LLM OCR", i + 1, len(images))
-                page_start = time.time()
+            parts = [
+                f"Page {page_num}:\n{page_text}\n\n" for page_num, page_text in enumerate(page_texts, 1)
+            ]
+            all_text = "".join(parts)
+            total_time = time.time() - start_time
+            logger.info("LLM OCR extraction completed in %.2f seconds, total %d chars", total_time, len(all_text))
+            return all_text
+        except Exception as e:
+            elapsed = time.time() - start_time
+            logger.error("Error extracting text with LLM OCR after %.2f seconds: %s", elapsed, str(e), exc_info=True)
+            return ""
 
-                # Encode image to base64 for API
-                encode_start = time.time()
-                buffered = io.BytesIO()
-                img.save(buffered, format="PNG")
-                img_str = base64.b64encode(buffered.getvalue()).decode()
-                encode_time = time.time() - encode_start
-                logger.info("Image %d encoded in %.2f seconds", i + 1, encode_time)
+    def _page_ocr_messages(self, img: Image.Image) -> List[dict]:
+        """Build the OCR prompt messages for a single page image.
 
-                # Create prompt with the image
-                messages = [
+        JPEG at quality 85 is several times smaller than PNG for page-sized
+        rasters and skips PNG's deflate cost; smaller payloads also mean
+        fewer vision tokens. Downscale to the configured vision cap first —
+        work on a copy since the page images may be shared with the other
+        tools.
+        """
+        page_img = img.copy()
+        if page_img.mode != "RGB":
+            page_img = page_img.convert("RGB")
+        page_img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.Resampling.LANCZOS)
+        img_str = b64encode(encode_jpeg(page_img)).decode("ascii")
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Extract all the text from this image. "
+                        "Include all text content, preserving paragraphs, "
+                        "bullet points, and formatting as much as possible.",
+                    },
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Extract all the text from this image. "
-                                "Include all text content, preserving paragraphs, "
-                                "bullet points, and formatting as much as possible.",
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{img_str}"},
-                            },
-                        ],
-                    }
-                ]
-
-                # Call LLM
-                logger.info("Sending image %d to LLM API", i + 1)
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/jpeg;base64,{img_str}"},
+                    },
+                ],
+            }
+        ]
+
+    def _ocr_page_images(self, images: List[Image.Image], page_numbers: List[int], llm: Any) -> List[str]:
+        """OCR a list of page images with the vision LLM.
+
+        Args:
+            images: Page images to OCR.
+            page_numbers: 1-based page number of each image, for logging.
+            llm: Vision-capable LLM instance.
+
+        Returns:
+            One extracted text per image, in the order given.
+        """
+        if not images:
+            return []
+        try:
+            # Build the per-page prompts upfront, then dispatch them as one
+            # batch — each page's OCR is independent, so the round-trips can
+            # overlap instead of paying N sequential API latencies. Encoding
+            # runs on a thread pool: PIL releases the GIL inside libjpeg, so
+            # pages encode in parallel instead of serially on this thread.
+            encode_start = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(images), _ENCODE_THREADS)) as pool:
+                all_messages = list(pool.map(self._page_ocr_messages, images))
+            encode_time = time.time() - encode_start
+            logger.info("Encoded %d images in %.2f seconds", len(all_messages), encode_time)
+
+            # Serve pages seen before from the response cache (temperature=0
+            # makes the calls deterministic) and only batch the misses
+            cache = get_default_cache()
+            model_name = getattr(llm, "model_name", "") or ""
+            page_texts: List[Optional[str]] = [None] * len(all_messages)
+            cache_keys: List[Optional[str]] = [None] * len(all_messages)
+            if cache is not None:
+                for i, messages in enumerate(all_messages):
+                    cache_key = LLMCache.make_key(messages, model_name)
+                    cache_keys[i] = cache_key
+                    page_texts[i] = cache.get(cache_key)
+
+            miss_indices = [i for i, text in enumerate(page_texts) if text is None]
+            total_tokens = 0
+            if miss_indices:
+                logger.info("Sending %d images to LLM API as a batch", len(miss_indices))
                 llm_start = time.time()
-                response = llm.invoke(messages)
-                page_text = response.content
+                responses = batch_with_retry(llm, [all_messages[i] for i in miss_indices])
                 llm_time = time.time() - llm_start
-                logger.info("LLM returned %d chars for image %d in %.2f seconds", len(page_text), i + 1, llm_time)
+                logger.info("LLM OCR batch of %d pages completed in %.2f seconds", len(responses), llm_time)
 
-                # Check if token information is available (depends on the LLM implementation)
-                if hasattr(response, "usage") and response.usage is not None:
-                    page_tokens = getattr(response.usage, "total_tokens", 0)
-                    total_tokens += page_tokens
-                    logger.info("OCR token usage for page %d: %d tokens", i + 1, page_tokens)
+                # Per-page details only at DEBUG — at INFO the batch summary
+                # lines above and below cover the run without a log line per page
+                per_page_logs = logger.isEnabledFor(logging.DEBUG)
+                failed_pages = []
+                for i, response in zip(miss_indices, responses):
+                    if isinstance(response, Exception):
+                        # Leave the page empty rather than failing the whole
+                        # document; the miss is reported once below
+                        failed_pages.append(page_numbers[i])
+                        continue
+                    page_text = response.content
+                    if per_page_logs:
+                        logger.debug("LLM returned %d chars for page %d", len(page_text), page_numbers[i])
 
-                all_text += f"Page {i + 1}:\n{page_text}\n\n"
+                    # Check if token information is available (depends on the LLM implementation)
+                    if hasattr(response, "usage") and response.usage is not None:
+                        page_tokens = getattr(response.usage, "total_tokens", 0)
+                        total_tokens += page_tokens
+                        if per_page_logs:
+                            logger.debug("OCR token usage for page %d: %d tokens", page_numbers[i], page_tokens)
 
-                page_time = time.time() - page_start
-                logger.info("Completed processing image %d in %.2f seconds", i + 1, page_time)
+                    page_texts[i] = page_text
+                    cache_key = cache_keys[i]
+                    if cache is not None and cache_key is not None:
+                        cache.set(cache_key, page_text)
+                if failed_pages:
+                    logger.error("OCR failed after retries for %d pages: %s", len(failed_pages), failed_pages)
+            else:
+                logger.info("All %d pages served from the LLM cache", len(all_messages))
 
-            total_time = time.time() - start_time
-            logger.info("LLM OCR extraction completed in %.2f seconds, total %d chars", total_time, len(all_text))
             if total_tokens > 0:
                 logger.info("Total OCR token usage across all pages: %d tokens", total_tokens)
-            return all_text
+            return [page_text or "" for page_text in page_texts]
         except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error("Error extracting text with LLM OCR after %.2f seconds: %s", elapsed, str(e), exc_info=True)
-            return ""
+            logger.error("Error OCRing %d pages: %s", len(images), str(e), exc_info=True)
+            return ["" for _ in images]
@@ -1,201 +1,592 @@
-import base64
-import io
+import copy
+import functools
 import logging
+import math
+import os
+import re
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import camelot
-from langchain_openai import ChatOpenAI
-from pdf2image import convert_from_path
+import cv2
+import numpy
+import pymupdf
+from PIL import Image
+
+from pdf_mind.cache import TableCache, get_default_table_cache
+from pdf_mind.llm import VISION_MAX_SIDE, b64encode, batch_with_retry, encode_jpeg, get_llm
+from pdf_mind.pdf_document import PDFDocument, get_mp_context, rasterize_pages, rasterize_pdf
 
 # Get logger
 logger = logging.getLogger("pdf_extraction_agent.table_extractor")
 
+# Threads for encoding page images before the LLM batch; the encoders
+# release the GIL so a small pool overlaps the encodes
+_ENCODE_THREADS = 4
+
+# Lattice detection is CPU-bound per page, so long documents are sharded
+# across worker processes; short ones stay serial since fork and result
+# pickling overhead would dominate
+_MIN_PAGES_FOR_POOL = 8
+
+# Pages packed into one vision call in the LLM fallback. Grouping
+# amortizes the fixed prompt tokens and request latency across pages;
+# beyond a few images per call the model starts conflating pages
+_PAGES_PER_CALL = 4
+
+# Header the grouped prompt asks the model to emit before each page's
+# tables, used to split the response back into per-page results
+_PAGE_HEADER_RE = re.compile(r"###\s*Page\s+(\d+)\s*:?\s*\n?")
+
+# Single entry in a page spec: a page number or an inclusive range
+_PAGE_RE = re.compile(r"(\d+)(?:-(\d+))?")
+
+# Ruling detection renders at a coarse DPI — line positions don't need
+# extraction-quality resolution, and the render dominates its cost
+_RULING_DETECT_DPI = 72
+
+# Long axis-aligned segments needed before a page counts as ruled
+_MIN_RULING_LINES = 4
+
+# Above this many tables in one batch, markdown rendering switches from
+# tabulate to the vectorized renderer
+_MAX_TABLES_FOR_TABULATE = 10
+
+
+def _df_to_markdown_fast(df: Any) -> str:
+    """Render a DataFrame as a markdown table without going through tabulate.
+
+    to_markdown goes through tabulate, which formats cell-by-cell in
+    Python and measures every column to pad it; vectorized string ops on
+    the whole frame emit the same pipe-delimited shape orders of
+    magnitude faster. Pipes in cells are escaped and embedded newlines
+    collapsed to spaces so a cell can't split its row, and the output
+    skips the visual padding, which markdown renderers ignore anyway.
+    """
+    cells = df.astype(str).replace({r"\|": r"\\|", r"\s*[\r\n]+\s*": " "}, regex=True)
+    header = [str(col).replace("|", "\\|").replace("\n", " ").replace("\r", " ") for col in df.columns]
+    lines = ["|".join(header), "|".join(["---"] * df.shape[1])]
+    lines.extend("|".join(row) for row in cells.to_numpy())
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_pages(pages: str, n_pages: int) -> Tuple[int, ...]:
+    """Resolve a page spec like "1,3-5" or "all" to 1-based page numbers.
+
+    Agent loops tend to re-request the same spec for the same document,
+    so results are cached; the tuple return keeps cache entries immutable.
+
+    Args:
+        pages: Page spec — comma-separated numbers and ranges, or "all".
+        n_pages: Total page count, used only to expand "all".
+
+    Returns:
+        The requested page numbers, 1-based, in spec order.
+    """
+    if pages == "all":
+        return tuple(range(1, n_pages + 1))
+    nums: List[int] = []
+    for match in _PAGE_RE.finditer(pages):
+        range_start = int(match.group(1))
+        range_end = int(match.group(2)) if match.group(2) else range_start
+        nums.extend(range(range_start, range_end + 1))
+    return tuple(nums)
+
+
+def _tables_to_dicts(tables_data: Any, include_data: bool = False) -> List[Dict[str, Any]]:
+    """Flatten Camelot Table objects into plain result dicts.
+
+    Structured cell data is only materialized on request: a dict per row
+    allocates a key string per cell, which doubles memory and CPU for a
+    field most callers never read. When requested it uses a columnar
+    layout — one list of column names plus plain row lists — which is
+    far cheaper than per-row dicts. Small batches render through
+    tabulate for its padded output; large ones switch to the vectorized
+    renderer, where rendering would otherwise dominate extraction.
+    """
+    result = []
+    fast_markdown = len(tables_data) > _MAX_TABLES_FOR_TABULATE
+    for table in tables_data:
+        df = table.df
+        result.append(
+            {
+                "page": table.page,
+                "markdown": _df_to_markdown_fast(df) if fast_markdown else df.to_markdown(index=False),
+                "nrows": len(df),
+                "data": {"columns": df.columns.tolist(), "rows": df.values.tolist()} if include_data else None,
+            }
+        )
+    return result
+
+
+def _read_tables_range(args: Tuple[str, str, str, bool]) -> List[Dict[str, Any]]:
+    """Run Camelot on one page shard; runs in a worker process.
+
+    Takes the path rather than parsed objects — pdfminer's interlinked
+    layout objects don't pickle — and returns plain dicts for the same
+    reason. Stream results are filtered to at least 2x2 cells: on plain
+    text pages the whitespace heuristic tends to report the whole page as
+    a one-column "table".
+    """
+    pdf_path, pages, flavor, include_data = args
+    tables_data: Any = camelot.read_pdf(pdf_path, pages=pages, flavor=flavor)
+    if flavor == "stream":
+        tables_data = [table for table in tables_data if table.df.shape[0] >= 2 and table.df.shape[1] >= 2]
+    return _tables_to_dicts(tables_data, include_data=include_data)
+
+
+def _detect_ruling(page: "pymupdf.Page") -> bool:
+    """Return True when a page carries ruled (bordered) table lines.
+
+    Renders the page in grayscale at a coarse DPI and runs a
+    probabilistic Hough transform over its edges; several long
+    axis-aligned segments are a strong signal for lattice-style ruling,
+    while text-only and stream-table pages produce few or none. The
+    render plus transform costs milliseconds — far less than running the
+    wrong Camelot flavor and falling through to the LLM.
+    """
+    pix = page.get_pixmap(dpi=_RULING_DETECT_DPI, colorspace=pymupdf.csGRAY)
+    img = numpy.frombuffer(pix.samples, dtype=numpy.uint8).reshape(pix.height, pix.width)
+    edges = cv2.Canny(img, 50, 150)
+    min_length = int(min(pix.width, pix.height) * 0.25)
+    lines = cv2.HoughLinesP(edges, 1, numpy.pi / 180, threshold=80, minLineLength=min_length, maxLineGap=4)
+    if lines is None:
+        return False
+    long_lines = 0
+    for x1, y1, x2, y2 in lines[:, 0]:
+        if abs(int(x1) - int(x2)) <= 2 or abs(int(y1) - int(y2)) <= 2:
+            long_lines += 1
+            if long_lines > _MIN_RULING_LINES:
+                return True
+    return False
+
 
 class TableExtractorTool:
     """Tool for extracting tables from PDFs and converting them to markdown."""
 
-    def extract_tables(self, pdf_path: str, llm: Optional[Any] = None, pages: str = "all") -> List[Dict[str, Any]]:
+    def __init__(self) -> None:
+        # Forgetful single-entry cache for per-page ruling detection: the
+        # agent works through one document at a time, so one entry keyed
+        # on (path, mtime_ns) covers repeat calls without a hash table
+        self._ruling_cache: Optional[Tuple[str, int, Dict[int, bool]]] = None
+
+    def extract_tables(
+        self,
+        pdf_path: str,
+        llm: Optional[Any] = None,
+        pages: str = "all",
+        doc: Optional[PDFDocument] = None,
+        ignore_cache: bool = False,
+        include_data: bool = False,
+    ) -> List[Dict[str, Any]]:
         """Extract tables from a PDF file.
 
+        Thin wrapper around iter_tables for callers that want the whole
+        list at once; see iter_tables for the argument semantics.
+
+        Returns:
+            List of extracted tables with page number and markdown.
+        """
+        return list(
+            self.iter_tables(
+                pdf_path,
+                llm=llm,
+                pages=pages,
+                doc=doc,
+                ignore_cache=ignore_cache,
+                include_data=include_data,
+            )
+        )
+
+    def iter_tables(
+        self,
+        pdf_path: str,
+        llm: Optional[Any] = None,
+        pages: str = "all",
+        doc: Optional[PDFDocument] = None,
+        ignore_cache: bool = False,
+        include_data: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield tables extracted from a PDF file, one at a time.
+
+        Generator facade over the batch extractors: Camelot (and the LLM
+        fallback, when it runs) still materializes its full result list
+        before the first yield, so this does not save extraction work on
+        early exit. Yielding per table keeps the consuming side
+        incremental — callers can format or stream each table without
+        first collecting the whole list the way extract_tables does.
+
         Args:
             pdf_path: Path to the PDF file.
             llm: Vision-capable LLM for analyzing tables. If None, it will be created.
             pages: Pages to extract tables from (e.g., "1,3,4" or "all").
+            doc: Shared PDFDocument to reuse rasterized pages for the LLM
+                fallback. If None, the PDF is rasterized directly.
+            ignore_cache: Skip the on-disk Camelot result cache for this call.
+            include_data: Also return structured cell data per table as
+                {"columns": [...], "rows": [...]}; off by default since
+                most callers only consume the markdown.
 
-        Returns:
-            List of extracted tables with page number and markdown.
+        Yields:
+            Extracted tables with page number and markdown, in page order.
         """
-        # First try with library-based extraction
-        tables = self._extract_with_camelot(pdf_path, pages)
+        # First try with library-based extraction. Within one process the
+        # same (path, pages) pair is often requested repeatedly across tool
+        # calls; memoize on the file's mtime so edits invalidate the entry.
+        try:
+            mtime_ns = os.stat(pdf_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if ignore_cache or mtime_ns is None:
+            tables = self._extract_with_camelot(pdf_path, pages, ignore_cache=ignore_cache, include_data=include_data)
+        else:
+            # Deep-copy so callers can't mutate the memoized entry
+            tables = copy.deepcopy(self._camelot_tables_memoized(pdf_path, mtime_ns, pages, include_data))
+
+        if tables:
+            yield from tables
+            return
 
         # If no tables are found or extraction failed, use LLM
-        if not tables:
-            if llm is None:
-                llm = ChatOpenAI(
-                    model="gpt-4o",
-                    temperature=0,
-                )
-            tables = self._extract_with_llm(pdf_path, llm, pages)
+        if llm is None:
+            llm = get_llm("gpt-4o")
+        yield from self._extract_with_llm(pdf_path, llm, pages, doc=doc)
 
-        return tables
+    @functools.lru_cache(maxsize=64)
+    def _camelot_tables_memoized(
+        self, pdf_path: str, mtime_ns: int, pages: str, include_data: bool
+    ) -> List[Dict[str, Any]]:
+        """Memoized Camelot extraction keyed on (path, mtime, pages, data).
 
-    def _extract_with_camelot(self, pdf_path: str, pages: str) -> List[Dict[str, Any]]:
-        """Extract tables using Camelot."""
+        mtime_ns is part of the key purely for invalidation — an edited
+        file gets a fresh parse. Only the deterministic Camelot path is
+        memoized; LLM fallbacks go through extract_tables uncached.
+        """
+        return self._extract_with_camelot(pdf_path, pages, include_data=include_data)
+
+    def _extract_with_camelot(
+        self, pdf_path: str, pages: str, ignore_cache: bool = False, include_data: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Extract tables using Camelot.
+
+        A page with no tables is a normal empty result; an unreadable
+        file is not, and raises so callers don't mistake a missing or
+        corrupt PDF for a table-free one (the old blanket handler
+        conflated the two and silently triggered the LLM fallback on
+        files the LLM couldn't read either).
+
+        Raises:
+            pymupdf.FileNotFoundError: If the PDF does not exist (or the
+                builtin FileNotFoundError when the disk cache keys the
+                file first).
+            pymupdf.FileDataError: If the file is not valid PDF data.
+            pypdf.errors.PdfReadError: If Camelot cannot parse the file.
+        """
         logger.info("Extracting tables with Camelot from %s, pages=%s", pdf_path, pages)
         start_time = time.time()
+        # Lattice extraction is deterministic, so identical file bytes
+        # and page spec can be served from the disk cache
+        cache = None if ignore_cache else get_default_table_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = TableCache.make_key(pdf_path, f"{pages}|data={include_data}")
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Resolve the page spec to explicit page numbers so the work
+        # can be sharded
+        n_pages = 0
+        if pages == "all":
+            with pymupdf.open(pdf_path) as pdf_doc:
+                n_pages = len(pdf_doc)
+        page_nums = list(_parse_pages(pages, n_pages))
+        logger.info("Processing %d pages (spec: %s)", len(page_nums), pages)
+
+        # Route each page to the flavor its layout matches: lattice only
+        # finds tables with ruled borders, so running it on whitespace-
+        # aligned (stream) tables returns nothing and used to drop the
+        # whole document into the LLM fallback. Pages beyond the end of
+        # the document are dropped here — Camelot raises IndexError on
+        # them, which shouldn't read as an unreadable file.
+        extraction_start = time.time()
+        ruling = self._page_ruling_map(pdf_path, page_nums)
+        if len(ruling) < len(page_nums):
+            logger.warning("Ignoring %d requested pages beyond the end of the document", len(page_nums) - len(ruling))
+            page_nums = [num for num in page_nums if num in ruling]
+        lattice_pages = [num for num in page_nums if ruling[num]]
+        stream_pages = [num for num in page_nums if not ruling[num]]
+        logger.info("Ruling detection routed %d pages to lattice, %d to stream", len(lattice_pages), len(stream_pages))
+        result = []
+        for flavor, flavor_pages in (("lattice", lattice_pages), ("stream", stream_pages)):
+            if flavor_pages:
+                result.extend(self._read_tables(pdf_path, flavor_pages, flavor, include_data))
+        result.sort(key=lambda table: table["page"])
+        extraction_time = time.time() - extraction_start
+        logger.info("Camelot found %d tables in %0.2f seconds", len(result), extraction_time)
+
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
+
+        elapsed = time.time() - start_time
+        logger.info("Camelot extraction completed in %0.2f seconds, found %d tables", elapsed, len(result))
+        return result
+
+    def _page_ruling_map(self, pdf_path: str, page_nums: List[int]) -> Dict[int, bool]:
+        """Classify the requested pages as ruled or unruled.
+
+        Results are held in a forgetful single-entry cache keyed on
+        (path, mtime_ns) — the agent processes one document at a time, so
+        repeat calls for the same file skip the renders entirely.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            page_nums: 1-based page numbers to classify.
+
+        Returns:
+            Mapping from page number to True when the page looks ruled.
+        """
         try:
-            # Convert pages parameter to format Camelot expects
-            if pages == "all":
-                pages = "1-end"
-                logger.info("Processing all pages")
-            else:
-                logger.info("Processing specific pages: %s", pages)
-
-            # Extract tables
-            logger.info("Calling Camelot to extract tables")
-            extraction_start = time.time()
-            tables_data = camelot.read_pdf(pdf_path, pages=pages, flavor="lattice")
-            extraction_time = time.time() - extraction_start
-            logger.info("Camelot found %d tables in %0.2f seconds", len(tables_data), extraction_time)
-
-            # Process extracted tables
-            result = []
-            for i, table in enumerate(tables_data):
-                logger.info("Processing table %d/%d", i + 1, len(tables_data))
-                table_start = time.time()
-
-                # Convert to pandas DataFrame
-                df = table.df
-
-                # Get page number
-                page_num = table.page
-                logger.info("Table %d is on page %d", i + 1, page_num)
-
-                # Convert to markdown
-                markdown = df.to_markdown(index=False)
-
-                result.append(
-                    {
-                        "page": page_num,
-                        "markdown": markdown,
-                        "data": df.to_dict(orient="records"),
-                    }
+            mtime_ns = os.stat(pdf_path).st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        if self._ruling_cache is not None:
+            cached_path, cached_mtime, cached_map = self._ruling_cache
+            if cached_path == pdf_path and cached_mtime == mtime_ns and all(num in cached_map for num in page_nums):
+                return cached_map
+        ruling: Dict[int, bool] = {}
+        with pymupdf.open(pdf_path) as pdf_doc:
+            for num in page_nums:
+                if 1 <= num <= len(pdf_doc):
+                    ruling[num] = _detect_ruling(pdf_doc[num - 1])
+        self._ruling_cache = (pdf_path, mtime_ns, ruling)
+        return ruling
+
+    def _read_tables(
+        self, pdf_path: str, page_nums: List[int], flavor: str, include_data: bool
+    ) -> List[Dict[str, Any]]:
+        """Run Camelot with one flavor over a set of pages.
+
+        Table detection is per-page and CPU-bound (OpenCV morphology plus
+        PDF parsing), so long runs are sharded across worker processes;
+        the Table objects hold interlinked pdfminer state that doesn't
+        pickle, so each worker flattens its shard to plain dicts before
+        returning. Short runs stay serial since fork overhead would
+        dominate.
+        """
+        workers = min(os.cpu_count() or 1, 8)
+        if len(page_nums) >= _MIN_PAGES_FOR_POOL and workers > 1:
+            pages_per_worker = math.ceil(len(page_nums) / workers)
+            shards = [
+                page_nums[shard_start : shard_start + pages_per_worker]
+                for shard_start in range(0, len(page_nums), pages_per_worker)
+            ]
+            logger.info(
+                "Extracting %s tables from %d pages across %d worker processes", flavor, len(page_nums), len(shards)
+            )
+            with get_mp_context().Pool(len(shards)) as pool:
+                chunks = pool.map(
+                    _read_tables_range,
+                    [(pdf_path, ",".join(map(str, shard)), flavor, include_data) for shard in shards],
                 )
+            # Shards are contiguous and in order, so flattening preserves
+            # page order
+            return [table for chunk in chunks for table in chunk]
+        return _read_tables_range((pdf_path, ",".join(map(str, page_nums)), flavor, include_data))
+
+    def _encode_page_image(self, img: Image.Image) -> str:
+        """Encode one page image as a base64 JPEG string for the vision API.
+
+        JPEG keeps the payload several times smaller than PNG for page-sized
+        rasters, and base64 inflates whatever it is fed by a further third.
+        Ruling lines survive quality 85 fine at this resolution. Downscale
+        to the vision cap first — on a copy, since the page images may be
+        shared with the other tools.
+        """
+        page_img = img
+        if page_img.mode != "RGB":
+            page_img = page_img.convert("RGB")
+        if max(page_img.size) > VISION_MAX_SIDE:
+            page_img = page_img.copy()
+            page_img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.Resampling.LANCZOS)
+        return b64encode(encode_jpeg(page_img)).decode("ascii")
+
+    def _page_group_table_messages(self, pages_group: List[Tuple[int, Image.Image]]) -> List[Dict[str, Any]]:
+        """Build one table-extraction prompt covering several page images.
+
+        Packing a handful of pages per call amortizes the fixed prompt
+        tokens and request latency over the group instead of paying them
+        per page. The prompt asks for a '### Page <n>' header before each
+        page's tables so the response can be split back apart.
+
+        Args:
+            pages_group: (1-based page number, page image) pairs for one call.
+        """
+        page_list = ", ".join(str(num) for num, _ in pages_group)
+        content: List[Dict[str, Any]] = [
+            {
+                "type": "text",
+                "text": f"Identify and extract all tables from the {len(pages_group)} page images below, "
+                f"which are pages {page_list} of a PDF, in that order. "
+                "For each image, reply with a line '### Page <page number>' followed by every "
+                "table on that page converted to markdown format. "
+                "Only include tables, not other text content. "
+                "If a page has no tables, write 'No tables found' under its header.",
+            }
+        ]
+        for _, img in pages_group:
+            content.append(
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/jpeg;base64,{self._encode_page_image(img)}"},
+                }
+            )
+        return [{"role": "user", "content": content}]
+
+    def _parse_group_tables(self, content: str, page_nums: List[int]) -> List[Dict[str, Any]]:
+        """Split a grouped response back into per-page table results.
 
-                table_time = time.time() - table_start
-                logger.info("Table %d processed in %0.2f seconds", i + 1, table_time)
+        Args:
+            content: The LLM response text for one page group.
+            page_nums: The 1-based page numbers that were in the group.
 
-            elapsed = time.time() - start_time
-            logger.info("Camelot extraction completed in %0.2f seconds, found %d tables", elapsed, len(result))
+        Returns:
+            Result dicts for the pages where tables were found.
+        """
+        result = []
+        parts = _PAGE_HEADER_RE.split(content)
+        if len(parts) == 1:
+            # No headers at all — for a single-page group, treat the whole
+            # response as that page's tables rather than dropping it
+            body = content.strip()
+            if len(page_nums) == 1 and body and "No tables found" not in body:
+                result.append({"page": page_nums[0], "markdown": body, "data": None})
             return result
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error("Error extracting tables with Camelot after %0.2f seconds: %s", elapsed, str(e), exc_info=True)
-            return []
 
-    def _extract_with_llm(self, pdf_path: str, llm: Any, pages: str) -> List[Dict[str, Any]]:
-        """Extract tables using a vision-capable LLM."""
+        seen = set()
+        for i in range(1, len(parts) - 1, 2):
+            page_num = int(parts[i])
+            body = parts[i + 1].strip()
+            if page_num not in page_nums or page_num in seen:
+                logger.warning("Ignoring unexpected page header %d in grouped table response", page_num)
+                continue
+            seen.add(page_num)
+            if body and "No tables found" not in body:
+                logger.debug("Tables found on page %d", page_num)
+                result.append({"page": page_num, "markdown": body, "data": None})
+            else:
+                logger.debug("No tables found on page %d", page_num)
+        return result
+
+    def _extract_with_llm(
+        self, pdf_path: str, llm: Any, pages: str, doc: Optional[PDFDocument] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract tables using a vision-capable LLM.
+
+        Per-call API failures are handled inside batch_with_retry and
+        degrade to per-page error records, so an exception escaping here
+        means the PDF itself couldn't be rendered — that propagates
+        rather than masquerading as a table-free document.
+
+        Raises:
+            FileNotFoundError: If the PDF does not exist.
+            pymupdf.FileDataError: If the file is not valid PDF data.
+        """
         logger.info("Extracting tables with LLM from %s, pages=%s", pdf_path, pages)
         start_time = time.time()
-        try:
-            # Convert PDF to images
-            logger.info("Converting PDF to images for LLM table extraction")
-            conversion_start = time.time()
-
-            if pages == "all":
-                images = convert_from_path(pdf_path)
-                page_indices = list(range(len(images)))
-                logger.info("Converting all %d pages to images", len(images))
+        # Convert PDF to images, reusing the shared rasterization if available
+        logger.info("Converting PDF to images for LLM table extraction")
+        conversion_start = time.time()
+
+        if pages == "all":
+            images = doc.page_images() if doc is not None else rasterize_pdf(pdf_path)
+            page_indices = list(range(len(images)))
+            logger.info("Converting all %d pages to images", len(images))
+        else:
+            # Parse pages string into list of page indices (0-based)
+            page_indices = [num - 1 for num in _parse_pages(pages, 0)]  # Convert to 0-based
+            logger.debug("Parsed page specification %s to 0-based indices: %s", pages, page_indices)
+
+            if doc is not None:
+                all_images = doc.page_images()
+                page_indices = [i for i in page_indices if i < len(all_images)]
+                images = [all_images[i] for i in page_indices]
             else:
-                # Parse pages string into list of page indices (0-based)
-                logger.info("Parsing page specification: %s", pages)
-                page_nums: List[int] = []
-                for part in pages.split(","):
-                    if "-" in part:
-                        start, end = map(int, part.split("-"))
-                        page_nums.extend(range(start, end + 1))
-                    else:
-                        page_nums.append(int(part))
-                page_indices = [num - 1 for num in page_nums]  # Convert to 0-based
-                logger.info("Converted to page indices (0-based): %s", page_indices)
-
-                images = convert_from_path(pdf_path)
-                logger.info("PDF converted to %d total images", len(images))
-                images = [images[i] for i in page_indices if i < len(images)]
-                logger.info("Selected %d images for processing", len(images))
-
-            conversion_time = time.time() - conversion_start
-            logger.info("PDF to image conversion completed in %0.2f seconds", conversion_time)
-
-            result = []
-
-            for i, img in enumerate(images):
-                page_num = page_indices[i] + 1  # Convert back to 1-based
-                logger.info("Processing image %d/%d (page %d)", i + 1, len(images), page_num)
-                page_start = time.time()
-
-                # Encode image to base64 for API
-                encode_start = time.time()
-                buffered = io.BytesIO()
-                img.save(buffered, format="PNG")
-                img_str = base64.b64encode(buffered.getvalue()).decode()
-                encode_time = time.time() - encode_start
-                logger.info("Image for page %d encoded in %0.2f seconds", page_num, encode_time)
-
-                # Create prompt with the image
-                messages = [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Identify and extract all tables from this image. "
-                                "Convert each table to markdown format. "
-                                "Only include tables, not other text content. "
-                                "If no tables are present, respond with 'No tables found'.",
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{img_str}"},
-                            },
-                        ],
-                    }
-                ]
-
-                # Call LLM
-                logger.info("Sending page %d to LLM API for table extraction", page_num)
-                llm_start = time.time()
-                response = llm.invoke(messages)
-                markdown_tables = response.content
-                llm_time = time.time() - llm_start
-                logger.info("LLM processed page %d in %0.2f seconds", page_num, llm_time)
+                # Drop requested pages beyond the end of the document —
+                # PyMuPDF raises on out-of-range access — then render just
+                # those pages instead of rasterizing the whole document
+                # and throwing most of it away
+                with pymupdf.open(pdf_path) as pdf_doc:
+                    n_pages = len(pdf_doc)
+                if any(i >= n_pages for i in page_indices):
+                    logger.warning(
+                        "Ignoring %d requested pages beyond the end of the document",
+                        sum(1 for i in page_indices if i >= n_pages),
+                    )
+                    page_indices = [i for i in page_indices if i < n_pages]
+                images = rasterize_pages(pdf_path, page_indices)
+            logger.info("Selected %d images for processing", len(images))
+
+        conversion_time = time.time() - conversion_start
+        logger.info("PDF to image conversion completed in %0.2f seconds", conversion_time)
+
+        # Pack pages into groups and build one prompt per group, then
+        # dispatch the groups as one batch — grouping amortizes the
+        # fixed prompt tokens per call and the batch overlaps the
+        # round-trips. Prompt building runs on a thread pool: the
+        # encoders release the GIL, so groups encode in parallel
+        # instead of serially on this thread.
+        encode_start = time.time()
+        n_images = len(images)
+        groups = [
+            [(idx + 1, img) for idx, img in zip(page_indices[i : i + _PAGES_PER_CALL], images[i : i + _PAGES_PER_CALL])]
+            for i in range(0, n_images, _PAGES_PER_CALL)
+        ]
+        all_messages = []
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(len(groups), _ENCODE_THREADS)) as pool:
+                all_messages = list(pool.map(self._page_group_table_messages, groups))
+        encode_time = time.time() - encode_start
+        logger.info("Encoded %d images into %d prompts in %0.2f seconds", n_images, len(groups), encode_time)
+
+        # The prompts embed the encoded copies, so only the page
+        # numbers are needed past this point; dropping the raster
+        # references frees the page bitmaps before the network
+        # round-trip instead of pinning them through it (a shared doc
+        # keeps its own cache alive regardless)
+        group_pages = [[num for num, _ in group] for group in groups]
+        del groups, images
+
+        result: List[Dict[str, Any]] = []
+        if all_messages:
+            logger.info("Sending %d pages to LLM API as %d batched calls", n_images, len(all_messages))
+            llm_start = time.time()
+            responses = batch_with_retry(llm, all_messages)
+            llm_time = time.time() - llm_start
+            logger.info("LLM table extraction batch of %d calls completed in %0.2f seconds", len(responses), llm_time)
+
+            total_tokens = 0
+            for page_nums_group, response in zip(group_pages, responses):
+                if isinstance(response, Exception):
+                    # One exhausted group shouldn't sink the rest of the
+                    # document; record the failure per page and move on
+                    logger.error("Table extraction failed for pages %s: %s", page_nums_group, str(response))
+                    result.extend(
+                        {"page": num, "markdown": None, "data": None, "error": str(response)}
+                        for num in page_nums_group
+                    )
+                    continue
 
                 # Check if token information is available
                 if hasattr(response, "usage") and response.usage is not None:
-                    page_tokens = getattr(response.usage, "total_tokens", 0)
-                    logger.info("Table extraction token usage for page %d: %d tokens", page_num, page_tokens)
-
-                # If tables were found
-                if "No tables found" not in markdown_tables:
-                    logger.info("Tables found on page %d", page_num)
-                    result.append(
-                        {
-                            "page": page_num,
-                            "markdown": markdown_tables,
-                            "data": None,  # We don't have structured data from LLM extraction
-                        }
-                    )
-                else:
-                    logger.info("No tables found on page %d", page_num)
+                    total_tokens += getattr(response.usage, "total_tokens", 0)
 
-                page_time = time.time() - page_start
-                logger.info("Completed processing page %d in %0.2f seconds", page_num, page_time)
+                result.extend(self._parse_group_tables(response.content, page_nums_group))
+            if total_tokens > 0:
+                logger.info("Table extraction token usage across all groups: %d tokens", total_tokens)
 
-            elapsed = time.time() - start_time
-            logger.info("LLM table extraction completed in %0.2f seconds, found %d tables", elapsed, len(result))
-            return result
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error("Error extracting tables with LLM after %0.2f seconds: %s", elapsed, str(e), exc_info=True)
-            return []
+        elapsed = time.time() - start_time
+        logger.info("LLM table extraction completed in %0.2f seconds, found %d tables", elapsed, len(result))
+        return result
@@ -12,7 +12,7 @@ setup(
         "pillow>=10.2.0",
         "pydantic>=2.10.6",
         "pandas>=2.2.0",
-        "pdf2image>=1.17.0",
+        "pymupdf>=1.24.0",
         "camelot-py[cv]>=0.11.0",
         "click>=8.1.7",
         "tabulate>=0.9.0",
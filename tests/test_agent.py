@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from pdf_mind.agent import PDFExtractionAgent
+
+
+class TestProcessBatch:
+    """Tests for the process_batch entry point."""
+
+    def test_returns_results_in_input_order(self):
+        """Test that the batch runs on one loop and keeps input order."""
+
+        async def fake_aprocess(self, pdf_path):
+            return {"content": pdf_path, "stats": {}}
+
+        agent = PDFExtractionAgent(openai_api_key="sk-test")
+        with patch.object(PDFExtractionAgent, "aprocess", fake_aprocess):
+            results = agent.process_batch(["a.pdf", "b.pdf", "c.pdf"])
+
+        assert [result["content"] for result in results] == ["a.pdf", "b.pdf", "c.pdf"]
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns an empty list."""
+        agent = PDFExtractionAgent(openai_api_key="sk-test")
+        assert agent.process_batch([]) == []
+
+    def test_failure_propagates(self):
+        """Test that a failing PDF surfaces its exception to the caller."""
+
+        async def fake_aprocess(self, pdf_path):
+            raise ValueError(pdf_path)
+
+        agent = PDFExtractionAgent(openai_api_key="sk-test")
+        with patch.object(PDFExtractionAgent, "aprocess", fake_aprocess):
+            try:
+                agent.process_batch(["bad.pdf"])
+            except ValueError as e:
+                assert str(e) == "bad.pdf"
+            else:
+                raise AssertionError("expected ValueError")
@@ -0,0 +1,54 @@
+from pdf_mind.cache import LLMCache, TableCache
+
+
+class TestLLMCache:
+    """Tests for the LLMCache class."""
+
+    def test_get_returns_none_on_miss(self, tmp_path):
+        """Test that a missing key reads as None."""
+        cache = LLMCache(cache_dir=str(tmp_path))
+        assert cache.get("deadbeef") is None
+
+    def test_set_then_get_roundtrip(self, tmp_path):
+        """Test that stored responses are read back verbatim."""
+        cache = LLMCache(cache_dir=str(tmp_path))
+        cache.set("somekey", "a cached description")
+        assert cache.get("somekey") == "a cached description"
+
+    def test_make_key_covers_messages_and_model(self):
+        """Test that the key changes with the prompt and the model."""
+        messages = [{"role": "user", "content": "describe"}]
+        key = LLMCache.make_key(messages, "gpt-4o")
+
+        assert key != LLMCache.make_key(messages, "gpt-4o-mini")
+        assert key != LLMCache.make_key([{"role": "user", "content": "other"}], "gpt-4o")
+        assert key == LLMCache.make_key(messages, "gpt-4o")
+
+
+class TestTableCache:
+    """Tests for the TableCache class."""
+
+    def test_get_returns_none_on_miss(self, tmp_path):
+        """Test that a missing key reads as None."""
+        cache = TableCache(cache_dir=str(tmp_path))
+        assert cache.get("deadbeef") is None
+
+    def test_set_then_get_roundtrip(self, tmp_path):
+        """Test that stored tables are read back structurally equal."""
+        cache = TableCache(cache_dir=str(tmp_path))
+        tables = [{"page": 1, "markdown": "| a |", "data": None}]
+        cache.set("somekey", tables)
+        assert cache.get("somekey") == tables
+
+    def test_make_key_covers_content_and_pages(self, tmp_path):
+        """Test that the key changes with the file bytes and the page spec."""
+        pdf_a = tmp_path / "a.pdf"
+        pdf_b = tmp_path / "b.pdf"
+        pdf_a.write_bytes(b"%PDF-1.4 fake content a")
+        pdf_b.write_bytes(b"%PDF-1.4 fake content b")
+
+        key = TableCache.make_key(str(pdf_a), "all")
+
+        assert key != TableCache.make_key(str(pdf_b), "all")
+        assert key != TableCache.make_key(str(pdf_a), "1,3")
+        assert key == TableCache.make_key(str(pdf_a), "all")
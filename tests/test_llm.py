@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, patch
+
+import openai
+
+from pdf_mind.llm import batch_with_retry
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    response = MagicMock(status_code=429)
+    response.headers = {}
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class TestBatchWithRetry:
+    """Tests for the batch_with_retry helper."""
+
+    def test_all_success_dispatches_once(self):
+        """Test that a clean batch makes a single dispatch and no sleep."""
+        llm = MagicMock()
+        llm.batch.return_value = ["a", "b", "c"]
+
+        with patch("pdf_mind.llm.time.sleep") as mock_sleep:
+            responses = batch_with_retry(llm, [["m1"], ["m2"], ["m3"]])
+
+        assert responses == ["a", "b", "c"]
+        assert llm.batch.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_retries_only_failed_slots_in_order(self):
+        """Test that retries resend just the failed prompts and preserve order."""
+        llm = MagicMock()
+        llm.batch.side_effect = [
+            ["a", _rate_limit_error(), "c", _rate_limit_error()],
+            ["b", "d"],
+        ]
+
+        with patch("pdf_mind.llm.time.sleep"):
+            responses = batch_with_retry(llm, [["m1"], ["m2"], ["m3"], ["m4"]])
+
+        assert responses == ["a", "b", "c", "d"]
+        assert llm.batch.call_count == 2
+        retried = llm.batch.call_args_list[1][0][0]
+        assert retried == [["m2"], ["m4"]]
+
+    def test_non_retryable_error_passes_through(self):
+        """Test that non-transient failures are not retried."""
+        llm = MagicMock()
+        error = ValueError("bad request")
+        llm.batch.return_value = ["a", error]
+
+        with patch("pdf_mind.llm.time.sleep") as mock_sleep:
+            responses = batch_with_retry(llm, [["m1"], ["m2"]])
+
+        assert responses == ["a", error]
+        assert llm.batch.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_exhausted_retries_leave_exception_in_slot(self):
+        """Test that a prompt still failing after the last attempt keeps its exception."""
+        llm = MagicMock()
+        error = _rate_limit_error()
+        llm.batch.return_value = [error]
+
+        with patch("pdf_mind.llm.time.sleep") as mock_sleep:
+            responses = batch_with_retry(llm, [["m1"]])
+
+        assert responses == [error]
+        # One initial dispatch plus three retry rounds
+        assert llm.batch.call_count == 4
+        assert mock_sleep.call_count == 3
+
+    def test_backoff_delays_grow_and_stay_bounded(self):
+        """Test that the backoff delay grows per attempt and never exceeds the cap."""
+        llm = MagicMock()
+        llm.batch.return_value = [_rate_limit_error()]
+
+        with patch("pdf_mind.llm.time.sleep") as mock_sleep, patch("pdf_mind.llm.random.random", return_value=0.5):
+            batch_with_retry(llm, [["m1"]])
+
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert delays == sorted(delays)
+        assert all(delay <= 30 for delay in delays)
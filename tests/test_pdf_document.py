@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock, patch
+
+from pdf_mind.pdf_document import PDFDocument
+
+
+class TestPDFDocument:
+    """Tests for the PDFDocument class."""
+
+    @patch("pdf_mind.pdf_document.pypdf.PdfReader")
+    @patch("pdf_mind.pdf_document.mmap.mmap")
+    @patch("pdf_mind.pdf_document.open", create=True)
+    def test_reader_is_memoized(self, mock_open, mock_mmap, mock_pdf_reader):
+        """Test that the file is mapped and parsed only once."""
+        doc = PDFDocument("test.pdf")
+
+        reader1 = doc.reader
+        reader2 = doc.reader
+
+        assert reader1 is reader2
+        mock_open.assert_called_once_with("test.pdf", "rb")
+        mock_mmap.assert_called_once()
+        mock_pdf_reader.assert_called_once_with(mock_mmap.return_value)
+
+    @patch("pdf_mind.pdf_document._pixmap_to_image")
+    @patch("pdf_mind.pdf_document.pymupdf.open")
+    @patch("pdf_mind.pdf_document.mmap.mmap")
+    @patch("pdf_mind.pdf_document.open", create=True)
+    def test_page_images_are_memoized(self, mock_open, mock_mmap, mock_pymupdf_open, mock_to_image):
+        """Test that pages are only rasterized once."""
+        mock_pymupdf_open.return_value.__enter__.return_value = [MagicMock(), MagicMock()]
+        doc = PDFDocument("test.pdf")
+
+        images1 = doc.page_images()
+        images2 = doc.page_images()
+
+        assert images1 is images2
+        assert len(images1) == 2
+        mock_pymupdf_open.assert_called_once()
+
+    @patch("pdf_mind.pdf_document.pypdf.PdfReader")
+    @patch("pdf_mind.pdf_document.mmap.mmap")
+    @patch("pdf_mind.pdf_document.open", create=True)
+    def test_close_releases_handle(self, mock_open, mock_mmap, mock_pdf_reader):
+        """Test that close releases the mapping, file handle, and cached state."""
+        doc = PDFDocument("test.pdf")
+        doc.reader  # Open and map the file
+
+        doc.close()
+
+        mock_mmap.return_value.close.assert_called_once()
+        mock_open.return_value.close.assert_called_once()
@@ -11,30 +11,33 @@ class TestPDFReaderTool:
         tool = PDFReaderTool()
         assert isinstance(tool, PDFReaderTool)
 
-    @patch("pdf_extraction_agent.tools.pdf_reader.pypdf.PdfReader")
-    def test_extract_with_pypdf(self, mock_pdf_reader):
-        """Test extracting text with PyPDF."""
-        # Set up mock
+    def test_extract_with_pypdf_fallback(self):
+        """Test that pypdf extracts the pages when PyMuPDF rejects the file."""
+        # Set up a shared document whose pypdf reader serves the pages
         mock_page = MagicMock()
         mock_page.extract_text.return_value = "This is test text."
-        mock_pdf_reader.return_value.pages = [mock_page]
+        mock_doc = MagicMock()
+        mock_doc.reader.pages = [mock_page]
 
-        # Create tool and extract text
+        # Create tool and extract text with the PyMuPDF path failing
         tool = PDFReaderTool()
-        text = tool._extract_with_pypdf("test.pdf")
+        with patch.object(PDFReaderTool, "_extract_page_texts", side_effect=RuntimeError("mupdf rejected")):
+            text = tool._extract_with_pypdf("test.pdf", doc=mock_doc)
 
         # Check results
         assert "This is test text." in text
-        mock_pdf_reader.assert_called_once()
         mock_page.extract_text.assert_called_once()
 
-    @patch("pdf_extraction_agent.tools.pdf_reader.pypdf.PdfReader")
-    def test_extract_text_pypdf_success(self, mock_pdf_reader):
-        """Test extract_text when PyPDF succeeds."""
+    @patch("pdf_mind.tools.pdf_reader.pymupdf.open")
+    def test_extract_text_pymupdf_success(self, mock_open):
+        """Test extract_text when PyMuPDF succeeds."""
         # Set up mock
         mock_page = MagicMock()
-        mock_page.extract_text.return_value = "This is test text."
-        mock_pdf_reader.return_value.pages = [mock_page]
+        mock_page.get_text.return_value = "This is test text."
+        mock_pdf = MagicMock()
+        mock_pdf.__len__.return_value = 1
+        mock_pdf.__iter__.return_value = iter([mock_page])
+        mock_open.return_value.__enter__.return_value = mock_pdf
 
         # Create tool and extract text
         tool = PDFReaderTool()
@@ -43,12 +46,12 @@ class TestPDFReaderTool:
         # Check results
         assert "This is test text." in text
 
-    @patch("pdf_extraction_agent.tools.pdf_reader.PDFReaderTool._extract_with_pypdf")
-    @patch("pdf_extraction_agent.tools.pdf_reader.PDFReaderTool._extract_with_llm_ocr")
-    def test_extract_text_fallback_to_llm(self, mock_llm_ocr, mock_pypdf):
-        """Test that extract_text falls back to LLM OCR when PyPDF fails."""
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._extract_pages")
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._extract_with_llm_ocr")
+    def test_extract_text_fallback_to_llm(self, mock_llm_ocr, mock_pages):
+        """Test that extract_text falls back to LLM OCR when extraction fails."""
         # Set up mocks
-        mock_pypdf.return_value = ""  # PyPDF fails
+        mock_pages.return_value = []  # Native extraction fails
         mock_llm_ocr.return_value = "Text extracted with LLM OCR."
 
         # Create tool and extract text
@@ -57,15 +60,34 @@ class TestPDFReaderTool:
 
         # Check results
         assert text == "Text extracted with LLM OCR."
-        mock_pypdf.assert_called_once()
+        mock_pages.assert_called_once()
         mock_llm_ocr.assert_called_once()
 
-    @patch("pdf_extraction_agent.tools.pdf_reader.PDFReaderTool._extract_with_pypdf")
-    @patch("pdf_extraction_agent.tools.pdf_reader.PDFReaderTool._extract_with_llm_ocr")
-    def test_no_fallback_when_disabled(self, mock_llm_ocr, mock_pypdf):
+    @patch("pdf_mind.tools.pdf_reader.rasterize_pages")
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._ocr_page_images")
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._extract_pages")
+    def test_per_page_ocr_fallback(self, mock_pages, mock_ocr, mock_raster):
+        """Test that only the incomplete pages are rasterized and OCRed."""
+        # Set up mocks: page 1 has plenty of text, page 2 came back empty
+        mock_pages.return_value = [" ".join(["word"] * 30), ""]
+        mock_raster.return_value = ["page-2-image"]
+        mock_ocr.return_value = ["OCR text for page two."]
+
+        # Create tool and extract text
+        tool = PDFReaderTool()
+        text = tool.extract_text("test.pdf", llm=MagicMock())
+
+        # Check results: only the empty page went through OCR
+        assert "OCR text for page two." in text
+        mock_raster.assert_called_once_with("test.pdf", [1])
+        assert mock_ocr.call_args[0][1] == [2]
+
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._extract_pages")
+    @patch("pdf_mind.tools.pdf_reader.PDFReaderTool._extract_with_llm_ocr")
+    def test_no_fallback_when_disabled(self, mock_llm_ocr, mock_pages):
         """Test that OCR fallback is not used when disabled."""
         # Set up mocks
-        mock_pypdf.return_value = ""  # PyPDF fails
+        mock_pages.return_value = []  # Native extraction fails
 
         # Create tool and extract text with fallback disabled
         tool = PDFReaderTool()
@@ -73,5 +95,29 @@ class TestPDFReaderTool:
 
         # Check results
         assert text == ""
-        mock_pypdf.assert_called_once()
+        mock_pages.assert_called_once()
         mock_llm_ocr.assert_not_called()
+
+
+class TestIsTextIncomplete:
+    """Tests for the scanned-page heuristic."""
+
+    def test_empty_text_is_incomplete(self):
+        """Test that an empty page is routed to OCR."""
+        tool = PDFReaderTool()
+        assert tool._is_text_incomplete("") is True
+
+    def test_few_words_is_incomplete(self):
+        """Test that a page below the word threshold is routed to OCR."""
+        tool = PDFReaderTool()
+        assert tool._is_text_incomplete("just a handful of words here") is True
+
+    def test_enough_words_is_complete(self):
+        """Test that a page at the word threshold is kept as-is."""
+        tool = PDFReaderTool()
+        assert tool._is_text_incomplete(" ".join(["word"] * 20)) is False
+
+    def test_whitespace_only_is_incomplete(self):
+        """Test that whitespace contributes no word-like tokens."""
+        tool = PDFReaderTool()
+        assert tool._is_text_incomplete("   \n\t  \n") is True
@@ -0,0 +1,84 @@
+import pandas as pd
+
+from pdf_mind.tools.table_extractor import TableExtractorTool, _df_to_markdown_fast, _parse_pages
+
+
+class TestParsePages:
+    """Tests for the _parse_pages spec parser."""
+
+    def test_all_expands_to_every_page(self):
+        """Test that "all" covers the full 1-based page range."""
+        assert _parse_pages("all", 4) == (1, 2, 3, 4)
+
+    def test_numbers_and_ranges(self):
+        """Test that comma-separated numbers and ranges expand in spec order."""
+        assert _parse_pages("1,3-5,8", 20) == (1, 3, 4, 5, 8)
+
+    def test_single_page(self):
+        """Test that a lone page number parses to itself."""
+        assert _parse_pages("7", 20) == (7,)
+
+
+class TestDfToMarkdownFast:
+    """Tests for the vectorized markdown renderer."""
+
+    def test_plain_frame_shape(self):
+        """Test that a plain frame renders header, separator, and rows."""
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        assert _df_to_markdown_fast(df) == "a|b\n---|---\n1|x\n2|y"
+
+    def test_pipes_in_cells_are_escaped(self):
+        """Test that pipe characters can't add columns to a row."""
+        df = pd.DataFrame({"a|b": ["x|y"], "n": [1]})
+        lines = _df_to_markdown_fast(df).split("\n")
+        assert lines[0] == "a\\|b|n"
+        assert lines[2] == "x\\|y|1"
+
+    def test_newlines_in_cells_cannot_split_rows(self):
+        """Test that embedded newlines collapse to spaces instead of breaking the row."""
+        df = pd.DataFrame({"a": ["line1\nline2"], "n": [1]})
+        assert _df_to_markdown_fast(df).split("\n")[2] == "line1 line2|1"
+
+    def test_quotes_are_not_csv_escaped(self):
+        """Test that double quotes pass through without CSV-style quoting."""
+        df = pd.DataFrame({"a": ['has "quotes"']})
+        assert _df_to_markdown_fast(df).split("\n")[2] == 'has "quotes"'
+
+
+class TestParseGroupTables:
+    """Tests for splitting grouped LLM responses back into per-page results."""
+
+    def test_splits_on_page_headers(self):
+        """Test that headered sections map to their page numbers."""
+        tool = TableExtractorTool()
+        content = "### Page 1:\n|a|b|\n|---|---|\n|1|2|\n### Page 3:\n|c|\n|---|\n|3|"
+        result = tool._parse_group_tables(content, [1, 3])
+        assert [entry["page"] for entry in result] == [1, 3]
+        assert "|a|b|" in result[0]["markdown"]
+
+    def test_headerless_single_page_uses_whole_response(self):
+        """Test that a single-page group without headers keeps the response."""
+        tool = TableExtractorTool()
+        result = tool._parse_group_tables("|a|\n|---|\n|1|", [4])
+        assert result == [{"page": 4, "markdown": "|a|\n|---|\n|1|", "data": None}]
+
+    def test_headerless_multi_page_yields_nothing(self):
+        """Test that a multi-page group without headers is dropped rather than misattributed."""
+        tool = TableExtractorTool()
+        assert tool._parse_group_tables("|a|\n|---|\n|1|", [1, 2]) == []
+
+    def test_no_tables_found_pages_are_skipped(self):
+        """Test that "No tables found" sections produce no entries."""
+        tool = TableExtractorTool()
+        content = "### Page 1:\nNo tables found\n### Page 2:\n|a|\n|---|\n|1|"
+        result = tool._parse_group_tables(content, [1, 2])
+        assert [entry["page"] for entry in result] == [2]
+
+    def test_unknown_and_duplicate_headers_are_ignored(self):
+        """Test that headers outside the group, or repeated, don't add entries."""
+        tool = TableExtractorTool()
+        content = "### Page 9:\n|x|\n|---|\n|9|\n### Page 1:\n|a|\n|---|\n|1|\n### Page 1:\n|b|\n|---|\n|2|"
+        result = tool._parse_group_tables(content, [1, 2])
+        assert len(result) == 1
+        assert result[0]["page"] == 1
+        assert "|a|" in result[0]["markdown"]